@@ -0,0 +1,116 @@
+/*
+ * Baseline LCP top-1 scan for run_babel_challenge.py (loaded via ctypes; optional).
+ *
+ * Same contract as _lcp_top1_vectorized: rows of `width` one-byte char codes (zero padded; see
+ * _u8_char_codes), true lengths in `lens` (already capped at max_len), ties resolve to the lowest index.
+ *
+ * Build (run_babel_challenge.py does this on first use if a C compiler is available):
+ *   cc -O3 -march=native -shared -fPIC -o _lcp_ext.so _lcp_ext.c
+ *
+ * With AVX2, 32 chars are compared per step: _mm256_cmpeq_epi8 + _mm256_movemask_epi8 gives one
+ * mask bit per char, so the first mismatch is tzcnt(~mask).
+ * With NEON (aarch64: Graviton, Ampere, Apple), 16 chars per step: vceqq_u8 gives 0xFF per equal
+ * char, vshrn_n_u16(.., 4) narrows that to one 0xF nibble per char, so the 64-bit lane mask's first
+ * mismatch is ctz(~mask) / 4. Otherwise a scalar loop is used.
+ *
+ * Built with -DLCP_WIDTH=<row width> (run_babel_challenge.py does this per --max-path-len), the row
+ * width is a compile-time constant: the vector loop's trip count and the row stride fold away and
+ * the loop is fully unrolled. The `width` arguments are then ignored (the caller passes the same value).
+ */
+
+#include <stdint.h>
+
+#ifdef LCP_WIDTH
+#define ROW_WIDTH ((int64_t)(LCP_WIDTH))
+#define UNROLL _Pragma("GCC unroll 64")
+#else
+#define ROW_WIDTH width
+#define UNROLL
+#endif
+
+#if defined(__AVX2__)
+#include <immintrin.h>
+#elif defined(__ARM_NEON)
+#include <arm_neon.h>
+#endif
+
+static int64_t row_lcp(const uint8_t *row, const uint8_t *q, int64_t width, int64_t lim)
+{
+    int64_t k = 0;
+    (void)width;
+#if defined(__AVX2__)
+    UNROLL
+    for (; k + 32 <= ROW_WIDTH && k < lim; k += 32) {
+        __m256i a = _mm256_loadu_si256((const __m256i *)(row + k));
+        __m256i b = _mm256_loadu_si256((const __m256i *)(q + k));
+        uint32_t mask = (uint32_t)_mm256_movemask_epi8(_mm256_cmpeq_epi8(a, b));
+        if (mask != 0xFFFFFFFFu) {
+            int64_t j = k + (int64_t)_tzcnt_u32(~mask);
+            return j < lim ? j : lim;
+        }
+    }
+#elif defined(__ARM_NEON)
+    UNROLL
+    for (; k + 16 <= ROW_WIDTH && k < lim; k += 16) {
+        uint8x16_t eq = vceqq_u8(vld1q_u8(row + k), vld1q_u8(q + k));
+        uint64_t mask = vget_lane_u64(vreinterpret_u64_u8(vshrn_n_u16(vreinterpretq_u16_u8(eq), 4)), 0);
+        if (mask != UINT64_MAX) {
+            int64_t j = k + (int64_t)(__builtin_ctzll(~mask) >> 2);
+            return j < lim ? j : lim;
+        }
+    }
+#endif
+    while (k < lim && row[k] == q[k])
+        k++;
+    return k < lim ? k : lim;
+}
+
+int64_t lcp_top1(const uint8_t *mat, int64_t n, int64_t width, const int64_t *lens,
+                 const uint8_t *q, int64_t q_len, int64_t *best_lcp_out)
+{
+    int64_t best = 0;
+    int64_t best_lcp = -1;
+    for (int64_t i = 0; i < n; i++) {
+        int64_t lim = lens[i] < q_len ? lens[i] : q_len;
+        if (lim <= best_lcp)
+            continue; /* cannot beat the current best (ties keep the lower index) */
+        int64_t l = row_lcp(mat + i * ROW_WIDTH, q, width, lim);
+        if (l > best_lcp) {
+            best_lcp = l;
+            best = i;
+        }
+    }
+    *best_lcp_out = best_lcp < 0 ? 0 : best_lcp;
+    return best;
+}
+
+/* Q queries (rows of `width` chars, lengths in q_lens) in one call: out_idx[j] = lcp_top1(.., q_j, ..). */
+void lcp_top1_batch(const uint8_t *mat, int64_t n, int64_t width, const int64_t *lens,
+                    const uint8_t *qs, const int64_t *q_lens, int64_t n_q, int64_t *out_idx)
+{
+    int64_t best_lcp;
+    for (int64_t j = 0; j < n_q; j++)
+        out_idx[j] = lcp_top1(mat, n, width, lens, qs + j * ROW_WIDTH, q_lens[j], &best_lcp);
+}
+
+/* Row width this build is specialized for (0 = generic). */
+int64_t lcp_row_width(void)
+{
+#ifdef LCP_WIDTH
+    return LCP_WIDTH;
+#else
+    return 0;
+#endif
+}
+
+/* Chars compared per step in this build (32 with AVX2, 16 with NEON, else 1); reported in results.json. */
+int lcp_simd_chars(void)
+{
+#if defined(__AVX2__)
+    return 32;
+#elif defined(__ARM_NEON)
+    return 16;
+#else
+    return 1;
+#endif
+}
@@ -1,22 +1,36 @@
 """
 Self-contained GPU energy sampling for the public Babel Challenge.
 
-Primary backend: NVML (pynvml) if installed.
-Fallback backend: nvidia-smi CSV polling.
+Primary backend: NVML, bound directly via ctypes (libnvidia-ml), else through pynvml if installed.
+Fallback backend: streaming nvidia-smi CSV (`-lms`).
 
 No repo-internal imports (this must work inside the exported public_release_maxwell repo).
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
+import ctypes
+import functools
+import multiprocessing
+import os
 import shutil
 import subprocess
 import threading
 import time
+import warnings
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:  # Optional: fused single-pass kernel for long offline runs.
+    from numba import njit  # type: ignore
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
 
 
 @dataclass(frozen=True)
@@ -30,91 +44,434 @@ class EnergySample:
     mem_total_mb: Optional[float] = None
 
 
-def integrate_energy_j(samples: List[EnergySample], duration_s: float) -> Optional[float]:
+# Decoded column order (EnergySample field names).
+_COLUMNS = ("t_s", "power_w", "temp_c", "gpu_util_pct", "mem_util_pct", "mem_used_mb", "mem_total_mb")
+assert tuple(f.name for f in fields(EnergySample)) == _COLUMNS
+
+# Stored sample: a 16-byte fixed-point record instead of a float64 per field.
+#   t_s f32 (sub-ms resolution over hours), power in deci-watts (0.1 W steps, < 6.5 kW),
+#   whole degrees / percent in u8, used memory in MiB (u32: 80 GB parts exceed u16).
+# Total memory is a per-device constant and lives in metadata["mem_total_mb"].
+# Telemetry archives commonly keep far less (windowed min/max/mean/std), so 0.1 W is generous.
+_SAMPLE_DTYPE = np.dtype(
+    {
+        "names": ["t_s", "power_dw", "temp_c", "gpu_util_pct", "mem_util_pct", "mem_used_mib"],
+        "formats": ["<f4", "<u2", "u1", "u1", "u1", "<u4"],
+    },
+    align=True,
+)
+assert _SAMPLE_DTYPE.itemsize == 16
+_U8_NA = 0xFF
+_U32_NA = 0xFFFFFFFF
+
+
+def _q_u8(x: Optional[float]) -> int:
+    return _U8_NA if x is None or x != x else min(max(int(round(x)), 0), _U8_NA - 1)
+
+
+def _encode_sample(
+    t_s: float,
+    power_w: float,
+    temp_c: Optional[float],
+    gpu_util_pct: Optional[float],
+    mem_util_pct: Optional[float],
+    mem_used_mb: Optional[float],
+) -> Tuple[float, int, int, int, int, int]:
+    return (
+        t_s,
+        min(max(int(round(power_w * 10.0)), 0), 0xFFFF),
+        _q_u8(temp_c),
+        _q_u8(gpu_util_pct),
+        _q_u8(mem_util_pct),
+        _U32_NA if mem_used_mb is None or mem_used_mb != mem_used_mb else min(max(int(round(mem_used_mb)), 0), _U32_NA - 1),
+    )
+
+
+def _decode_column(rec: np.ndarray, name: str, mem_total_mb: Optional[float]) -> np.ndarray:
     """
-    Trapezoid integration of power over [0, duration_s] => Joules.
-    Applies constant extrapolation to window edges.
+    One float64 column from packed records (NaN = missing).
     """
-    if duration_s <= 0.0 or not samples:
-        return None
+    if name == "t_s":
+        return rec["t_s"].astype(np.float64)
+    if name == "power_w":
+        return rec["power_dw"].astype(np.float64) / 10.0
+    if name == "mem_used_mb":
+        a = rec["mem_used_mib"]
+        return np.where(a == _U32_NA, np.nan, a.astype(np.float64))
+    if name == "mem_total_mb":
+        if mem_total_mb is None:
+            return np.full(rec.shape[0], np.nan)
+        return np.where(rec["mem_used_mib"] == _U32_NA, np.nan, float(mem_total_mb))
+    a = rec[name]
+    return np.where(a == _U8_NA, np.nan, a.astype(np.float64))
 
-    xs = sorted(samples, key=lambda s: float(s.t_s))
-    if not xs:
-        return None
 
-    energy = 0.0
+# numpy>=2 renamed trapz -> trapezoid.
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
 
-    # Left edge extrapolation (0 -> first sample)
-    t_first = float(xs[0].t_s)
-    p_first = float(xs[0].power_w)
-    if t_first > 0.0:
-        energy += p_first * min(t_first, duration_s)
-
-    # Trapezoids
-    for a, b in zip(xs, xs[1:]):
-        ta = float(a.t_s)
-        tb = float(b.t_s)
+
+def _integrate_trap_py(t: np.ndarray, p: np.ndarray, duration_s: float) -> float:
+    """
+    Single pass over sorted samples: clipped trapezoids plus constant edge extrapolation.
+    Same clip/skip rules as the numpy path; no temporaries.
+    """
+    n = t.shape[0]
+    energy = 0.0
+    if t[0] > 0.0:
+        energy += p[0] * min(t[0], duration_s)
+    for i in range(n - 1):
+        ta = t[i]
+        tb = t[i + 1]
         if tb <= ta:
             continue
         if ta >= duration_s:
             break
         seg_a = max(0.0, ta)
         seg_b = min(duration_s, tb)
-        if seg_b <= seg_a:
-            continue
-        dt = seg_b - seg_a
-        energy += 0.5 * (float(a.power_w) + float(b.power_w)) * dt
+        if seg_b > seg_a:
+            energy += 0.5 * (p[i] + p[i + 1]) * (seg_b - seg_a)
+    if t[n - 1] < duration_s:
+        energy += p[n - 1] * (duration_s - t[n - 1])
+    return energy
+
+
+if njit is not None:
+    try:
+        # Eager signature => compiled (or loaded from cache) once at import, not on first call.
+        _integrate_trap = njit("float64(float64[:], float64[:], float64)", cache=True, fastmath=True)(_integrate_trap_py)
+    except Exception:  # pragma: no cover - broken numba install
+        _integrate_trap = None
+else:
+    _integrate_trap = None
+
+
+def _opt(x: float) -> Optional[float]:
+    return None if x != x else float(x)  # NaN -> None
+
+
+def _as_columns(
+    samples: Union[Sequence[EnergySample], "EnergySampler"], names: Sequence[str] = _COLUMNS
+) -> Dict[str, np.ndarray]:
+    """
+    Samples as float64 columns (missing values are NaN).
+    """
+    if isinstance(samples, EnergySampler):
+        return samples.columns(names)
+    nan = float("nan")
+    if tuple(names) == _COLUMNS:
+        # All fields: one pass over the list into a single array('d') (instance dicts hold the fields
+        # in declaration order == _COLUMNS), then a transpose, instead of one pass per column.
+        flat = array("d", [nan if v is None else v for s in samples for v in s.__dict__.values()])
+        rows = np.frombuffer(flat, dtype=np.float64).reshape(-1, len(_COLUMNS))
+        return dict(zip(_COLUMNS, np.ascontiguousarray(rows.T)))
+    return {
+        name: np.asarray(
+            [v if (v := getattr(s, name)) is not None else nan for s in samples],
+            dtype=np.float64,
+        )
+        for name in names
+    }
+
+
+def _time_order(samples: Union[Sequence[EnergySample], "EnergySampler"], t: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Indices that sort samples by time, or None when they are already in order.
+    The sampler appends in wall-clock order, so its own buffer normally needs no sort at all.
+    """
+    if isinstance(samples, EnergySampler) and samples._sorted:
+        return None
+    if t.shape[0] < 2 or bool(np.all(t[1:] >= t[:-1])):
+        return None
+    return np.argsort(t, kind="stable")
+
+
+def integrate_energy_j(samples: Union[Sequence[EnergySample], "EnergySampler"], duration_s: float) -> Optional[float]:
+    """
+    Trapezoid integration of power over [0, duration_s] => Joules.
+    Applies constant extrapolation to window edges.
+    For an EnergySampler this reads the integral it accumulated while sampling.
+    """
+    if duration_s <= 0.0 or not len(samples):
+        return None
+    if isinstance(samples, EnergySampler):
+        energy = samples._energy_until(float(duration_s))
+        if energy is not None:
+            return energy
+
+    cols = _as_columns(samples, ("t_s", "power_w"))
+    t = cols["t_s"]
+    p = cols["power_w"]
+    order = _time_order(samples, t)
+    if order is not None:
+        t = t[order]
+        p = p[order]
+
+    # Only the samples bracketing [0, duration_s] contribute: keep the last one at/before 0 and the
+    # first one at/after duration_s (edge terms depend only on whether those lie inside the window).
+    n = t.shape[0]
+    lo = int(np.searchsorted(t, 0.0, side="right"))
+    hi = int(np.searchsorted(t, duration_s, side="left"))
+    if lo > 1 or hi < n - 1:
+        t = t[max(lo - 1, 0) : hi + 1]
+        p = p[max(lo - 1, 0) : hi + 1]
+
+    if _integrate_trap is not None:
+        return float(_integrate_trap(t, p, float(duration_s)))
+
+    # Trapezoids over the window: clipping t to [0, duration_s] zeroes the width of every
+    # out-of-window segment and trims the straddling ones; repeated timestamps have zero width.
+    t_c = np.clip(t, 0.0, duration_s)
+    energy = float(_trapezoid(p, t_c))
+
+    # Left edge extrapolation (0 -> first sample)
+    if t[0] > 0.0:
+        energy += float(p[0]) * min(float(t[0]), duration_s)
 
     # Right edge extrapolation (last sample -> duration)
-    t_last = float(xs[-1].t_s)
-    p_last = float(xs[-1].power_w)
-    if t_last < duration_s:
-        energy += p_last * (duration_s - t_last)
+    if t[-1] < duration_s:
+        energy += float(p[-1]) * (duration_s - float(t[-1]))
 
     return float(energy)
 
 
-def samples_to_timeseries(samples: List[EnergySample], *, max_points: int = 1200) -> Dict[str, Any]:
+def _window_mean(a: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    NaN-ignoring mean of each window a[starts[i]:starts[i+1]] (NaN where a window has no values).
+    """
+    nan = np.isnan(a)
+    total = np.add.reduceat(np.where(nan, 0.0, a), starts)
+    count = np.add.reduceat((~nan).astype(np.float64), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def samples_to_timeseries(
+    samples: Union[Sequence[EnergySample], "EnergySampler"], *, max_points: int = 1200
+) -> Dict[str, Any]:
     """
-    Convert raw samples to a compact, JSON-friendly timeseries.
-    Size-bounded via uniform downsampling.
+    Convert raw samples to a compact timeseries.
+
+    Size-bounded by aggregating the time-ordered samples into at most `max_points` contiguous
+    windows (sizes differ by at most one). Every series is the per-window mean; power also gets
+    the per-window min/max/std so spikes between points are not lost. With n <= max_points each
+    window is a single sample and the series are the raw samples.
+
+    Series are float64 numpy arrays (NaN = no reading), left unboxed for the JSON writer: orjson's
+    OPT_SERIALIZE_NUMPY encodes them directly, NaN as null (run_babel_challenge._write_json does the same
+    through the stdlib encoder).
     """
-    xs = sorted(samples, key=lambda s: float(s.t_s))
-    n = len(xs)
+    n = len(samples)
     if n == 0:
         return {"downsample": {"original_samples": 0, "kept": 0, "max_points": int(max_points)}}
 
     if max_points <= 0:
         max_points = 1
 
-    if n > max_points:
-        stride = max(1, n // max_points)
-        ys = xs[::stride]
-        if ys and ys[-1].t_s != xs[-1].t_s:
-            ys.append(xs[-1])
-    else:
-        ys = xs
+    cols = _as_columns(samples)
+    order = _time_order(samples, cols["t_s"])
+    if order is not None:
+        cols = {name: a[order] for name, a in cols.items()}
+    m = min(n, max_points)
+    starts = (np.arange(m, dtype=np.int64) * n) // m
+    counts = np.diff(np.append(starts, n))
 
-    def _arr(getter):
-        return [getter(s) for s in ys]
+    p = cols["power_w"]
+    p_mean = _window_mean(p, starts)
+    dev = p - np.repeat(p_mean, counts)
+    p_std = np.sqrt(_window_mean(dev * dev, starts))
 
     return {
-        "t_s": _arr(lambda s: float(s.t_s)),
-        "power_w": _arr(lambda s: float(s.power_w)),
-        "gpu_util_pct": _arr(lambda s: float(s.gpu_util_pct) if s.gpu_util_pct is not None else None),
-        "temp_c": _arr(lambda s: float(s.temp_c) if s.temp_c is not None else None),
-        "mem_used_mb": _arr(lambda s: float(s.mem_used_mb) if s.mem_used_mb is not None else None),
-        "mem_total_mb": _arr(lambda s: float(s.mem_total_mb) if s.mem_total_mb is not None else None),
-        "downsample": {"original_samples": int(n), "kept": int(len(ys)), "max_points": int(max_points)},
+        "t_s": _window_mean(cols["t_s"], starts),
+        "power_w": p_mean,
+        "power_w_min": np.fmin.reduceat(p, starts),
+        "power_w_max": np.fmax.reduceat(p, starts),
+        "power_w_std": p_std,
+        "gpu_util_pct": _window_mean(cols["gpu_util_pct"], starts),
+        "temp_c": _window_mean(cols["temp_c"], starts),
+        "mem_used_mb": _window_mean(cols["mem_used_mb"], starts),
+        "mem_total_mb": _window_mean(cols["mem_total_mb"], starts),
+        "downsample": {
+            "original_samples": int(n),
+            "kept": int(m),
+            "max_points": int(max_points),
+            "method": "window_mean",
+            "window_samples_max": int(counts.max()),
+        },
     }
 
 
-def _run_cmd(cmd: List[str], timeout_s: float) -> Tuple[int, str, str]:
-    r = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_s, check=False)
-    return r.returncode, (r.stdout or "").strip(), (r.stderr or "").strip()
+# Power readings are refreshed by the driver only every ~20 ms (V100) to ~100 ms (A100/H100);
+# below this interval, ticks that only repeat the last power value are not stored.
+_POWER_PERIOD_PROBE_BELOW_S = 0.1
+
+
+def _calibrate_power_period(
+    read_power: Callable[[], float],
+    wait: Callable[[float], bool],
+    *,
+    budget_s: float = 1.0,
+    max_reads: int = 200,
+    changes: int = 5,
+) -> Optional[float]:
+    """
+    Estimate the driver's power update period by polling `read_power` (up to `max_reads` reads spread
+    over `budget_s`) and timing value changes. `wait(gap)` pauses between reads and returns True to abort
+    (the sampler's stop event). Returns the median change interval, or None if aborted or too few changes
+    were seen (e.g. an idle, flat-power GPU) to tell.
+    """
+    perf = time.perf_counter
+    gap = budget_s / max_reads
+    t_end = perf() + budget_s
+    last = read_power()
+    change_ts: List[float] = []
+    for _ in range(max_reads):
+        if wait(gap):
+            return None
+        now = perf()
+        if now >= t_end or len(change_ts) >= changes:
+            break
+        raw = read_power()
+        if raw != last:
+            change_ts.append(now)
+            last = raw
+    if len(change_ts) < 4:
+        return None
+    return float(np.median(np.diff(change_ts)))
+
+
+class _NVMLError(Exception):
+    def __init__(self, fn: str, code: int):
+        super().__init__(f"{fn} failed: nvmlReturn_t={code}")
+        self.code = code
+
+
+class _NvmlUtilization(ctypes.Structure):
+    _fields_ = [("gpu", ctypes.c_uint), ("memory", ctypes.c_uint)]
+
+
+class _NvmlMemory(ctypes.Structure):
+    _fields_ = [("total", ctypes.c_ulonglong), ("free", ctypes.c_ulonglong), ("used", ctypes.c_ulonglong)]
+
+
+class _CtypesNVML:
+    """
+    Minimal direct binding to libnvidia-ml, exposing the pynvml names `_run` uses.
+
+    Each call is one raw foreign call into preallocated output buffers: no per-call library
+    lookup, exception translation or struct copies as in pynvml. Returned structs are reused,
+    so read them before the next call.
+    """
+
+    NVML_TEMPERATURE_GPU = 0
+
+    def __init__(self, lib: ctypes.CDLL):
+        P = ctypes.POINTER
+        dev = ctypes.c_void_p
+        self._lib = lib
+        for name, argtypes in (
+            ("nvmlInit_v2", []),
+            ("nvmlDeviceGetHandleByIndex_v2", [ctypes.c_uint, P(dev)]),
+            ("nvmlDeviceGetPowerUsage", [dev, P(ctypes.c_uint)]),
+            ("nvmlDeviceGetPowerManagementLimit", [dev, P(ctypes.c_uint)]),
+            ("nvmlDeviceGetTemperature", [dev, ctypes.c_int, P(ctypes.c_uint)]),
+            ("nvmlDeviceGetUtilizationRates", [dev, P(_NvmlUtilization)]),
+            ("nvmlDeviceGetMemoryInfo", [dev, P(_NvmlMemory)]),
+            ("nvmlDeviceGetName", [dev, ctypes.c_char_p, ctypes.c_uint]),
+            ("nvmlDeviceGetPersistenceMode", [dev, P(ctypes.c_int)]),
+        ):
+            fn = getattr(lib, name)
+            fn.argtypes = argtypes
+            fn.restype = ctypes.c_int
+        self._power = ctypes.c_uint()
+        self._power_ref = ctypes.byref(self._power)
+        self._temp = ctypes.c_uint()
+        self._temp_ref = ctypes.byref(self._temp)
+        self._util = _NvmlUtilization()
+        self._util_ref = ctypes.byref(self._util)
+        self._mem = _NvmlMemory()
+        self._mem_ref = ctypes.byref(self._mem)
+        self._get_power = lib.nvmlDeviceGetPowerUsage
+        self._get_temp = lib.nvmlDeviceGetTemperature
+        self._get_util = lib.nvmlDeviceGetUtilizationRates
+        self._get_mem = lib.nvmlDeviceGetMemoryInfo
+
+    @classmethod
+    def load(cls) -> Optional["_CtypesNVML"]:
+        for name in ("libnvidia-ml.so.1", "libnvidia-ml.so", "nvml.dll"):
+            try:
+                return cls(ctypes.CDLL(name))
+            except (OSError, AttributeError):
+                continue
+        return None
+
+    @staticmethod
+    def _check(fn: str, ret: int) -> None:
+        if ret != 0:
+            raise _NVMLError(fn, ret)
+
+    def nvmlInit(self) -> None:
+        self._check("nvmlInit_v2", self._lib.nvmlInit_v2())
+
+    def nvmlDeviceGetHandleByIndex(self, index: int) -> ctypes.c_void_p:
+        h = ctypes.c_void_p()
+        self._check("nvmlDeviceGetHandleByIndex_v2", self._lib.nvmlDeviceGetHandleByIndex_v2(index, ctypes.byref(h)))
+        return h
+
+    def nvmlDeviceGetPowerUsage(self, h: ctypes.c_void_p) -> int:
+        ret = self._get_power(h, self._power_ref)
+        if ret:
+            raise _NVMLError("nvmlDeviceGetPowerUsage", ret)
+        return self._power.value
+
+    def nvmlDeviceGetTemperature(self, h: ctypes.c_void_p, sensor: int) -> int:
+        ret = self._get_temp(h, sensor, self._temp_ref)
+        if ret:
+            raise _NVMLError("nvmlDeviceGetTemperature", ret)
+        return self._temp.value
+
+    def nvmlDeviceGetUtilizationRates(self, h: ctypes.c_void_p) -> _NvmlUtilization:
+        ret = self._get_util(h, self._util_ref)
+        if ret:
+            raise _NVMLError("nvmlDeviceGetUtilizationRates", ret)
+        return self._util
+
+    def nvmlDeviceGetMemoryInfo(self, h: ctypes.c_void_p) -> _NvmlMemory:
+        ret = self._get_mem(h, self._mem_ref)
+        if ret:
+            raise _NVMLError("nvmlDeviceGetMemoryInfo", ret)
+        return self._mem
+
+    def nvmlDeviceGetPowerManagementLimit(self, h: ctypes.c_void_p) -> int:
+        out = ctypes.c_uint()
+        self._check("nvmlDeviceGetPowerManagementLimit", self._lib.nvmlDeviceGetPowerManagementLimit(h, ctypes.byref(out)))
+        return out.value
+
+    def nvmlDeviceGetName(self, h: ctypes.c_void_p) -> str:
+        buf = ctypes.create_string_buffer(96)
+        self._check("nvmlDeviceGetName", self._lib.nvmlDeviceGetName(h, buf, len(buf)))
+        return buf.value.decode("utf-8", "replace")
+
+    def nvmlDeviceGetPersistenceMode(self, h: ctypes.c_void_p) -> int:
+        out = ctypes.c_int()
+        self._check("nvmlDeviceGetPersistenceMode", self._lib.nvmlDeviceGetPersistenceMode(h, ctypes.byref(out)))
+        return out.value
+
+
+def _load_nvml() -> Tuple[Any, str]:
+    """
+    NVML binding for the sampler: direct ctypes when libnvidia-ml loads, else pynvml (ImportError if neither).
+    """
+    lib = _CtypesNVML.load()
+    if lib is not None:
+        return lib, "ctypes"
+    import pynvml  # type: ignore
 
+    return pynvml, "pynvml"
 
+
+@functools.lru_cache(maxsize=1)
 def _nvidia_smi_exe() -> str:
+    # Resolved once per process: PATH lookup + stat are not free on a loaded host.
     p = shutil.which("nvidia-smi")
     if p:
         return p
@@ -123,33 +480,74 @@ def _nvidia_smi_exe() -> str:
     return "nvidia-smi"
 
 
-def _nvidia_smi_sample(gpu_id: int) -> Optional[EnergySample]:
-    code, out, _err = _run_cmd(
-        [
-            _nvidia_smi_exe(),
-            f"--id={gpu_id}",
-            "--query-gpu=power.draw,temperature.gpu,utilization.gpu,utilization.memory,memory.used,memory.total",
-            "--format=csv,noheader,nounits",
-        ],
-        timeout_s=3.0,
-    )
-    if code != 0 or not out:
+# One reading in `_append` argument order: power_w, temp_c, gpu_util_pct, mem_util_pct, mem_used_mb, mem_total_mb.
+_Snapshot = Tuple[float, Optional[float], Optional[float], Optional[float], Optional[float], Optional[float]]
+
+_SMI_QUERY = "--query-gpu=power.draw,temperature.gpu,utilization.gpu,utilization.memory,memory.used,memory.total"
+
+
+def _parse_smi_csv_line(line: str) -> Optional[List[float]]:
+    """
+    One `_SMI_QUERY` CSV line -> [power_w, temp_c, gpu_util_pct, mem_util_pct, mem_used_mb, mem_total_mb].
+
+    Parsed in a single numpy C call instead of split/strip/float per field. Fields the driver
+    reports as `[N/A]` become NaN; lines without a power reading (or malformed) are dropped.
+    """
+    try:
+        row = np.fromstring(line.replace("[N/A]", "nan"), dtype=np.float64, sep=",")
+    except ValueError:
         return None
-    parts = [p.strip() for p in out.split(",")]
-    if len(parts) < 6:
+    if row.shape[0] < 6 or row[0] != row[0]:
         return None
+    return row[:6].tolist()
+
+
+def _smi_snapshot(row: List[float]) -> _Snapshot:
+    # NaN ([N/A]) columns are stored as missing by the record encoder; only mem_total needs a None.
+    p_w, temp_c, gpu_util, mem_util, mem_used_mb, mem_total_mb = row
+    return p_w, temp_c, gpu_util, mem_util, mem_used_mb, (mem_total_mb if mem_total_mb == mem_total_mb else None)
+
+
+def _nvidia_smi_stream(gpu_id: int, interval_ms: int) -> Iterator[List[float]]:
+    """
+    Stream samples from a single long-lived `nvidia-smi -lms` process.
+
+    One fork/exec + driver attach for the whole run instead of one per sample.
+    The process is terminated when the generator is closed.
+    """
     try:
-        return EnergySample(
-            t_s=0.0,  # filled by sampler
-            power_w=float(parts[0]),
-            temp_c=float(parts[1]),
-            gpu_util_pct=float(parts[2]),
-            mem_util_pct=float(parts[3]),
-            mem_used_mb=float(parts[4]),
-            mem_total_mb=float(parts[5]),
+        proc = subprocess.Popen(
+            [
+                _nvidia_smi_exe(),
+                f"--id={gpu_id}",
+                _SMI_QUERY,
+                "--format=csv,noheader,nounits",
+                "-lms",
+                str(max(1, int(interval_ms))),
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
         )
-    except ValueError:
-        return None
+    except OSError:
+        return
+    try:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            row = _parse_smi_csv_line(line)
+            if row is not None:
+                yield row
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=3.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# Upper bound on waiting for the sampling thread in stop() (plus two sample intervals).
+_STOP_JOIN_TIMEOUT_S = 10.0
 
 
 class EnergySampler:
@@ -157,41 +555,376 @@ class EnergySampler:
     Background sampler that collects power/util/temp while a workload runs.
     """
 
-    def __init__(self, gpu_id: int, sample_interval_s: float):
+    def __init__(
+        self,
+        gpu_id: int,
+        sample_interval_s: float,
+        *,
+        isolate_process: bool = False,
+        ring_capacity: int = 1 << 20,
+        max_samples: int = 1 << 16,
+        pin_cpu: Optional[int] = None,
+        realtime_priority: Optional[int] = None,
+    ):
+        """
+        isolate_process: sample from a child process (own interpreter/GIL) that writes into a
+            shared-memory ring, so sampling neither competes with nor jitters the measured workload.
+        ring_capacity: ring size in records for isolate_process (oldest records are overwritten).
+        max_samples: cap on stored records (16 B each). When full, every other record is dropped
+            and only every 2nd (then 4th, ...) later sample is kept; energy is still integrated over
+            every sample as it arrives, so integrate_energy_j is exact up to any stored record and the
+            latest sample. A window ending between two stored records is interpolated from the running
+            integral, off by at most the energy of that gap (see `_energy_until`).
+        pin_cpu: opt-in; pin the sampling thread (or child process) to this CPU, ideally one kept
+            free of the workload (isolcpus / taskset), so it is not preempted into bursty gaps.
+        realtime_priority: opt-in; run the sampling thread under SCHED_FIFO at this priority (1..99).
+            Needs CAP_SYS_NICE (or root); without it the sampler keeps the normal policy.
+        What was applied (or why not) is recorded in `metadata["sampler_sched"]`.
+        """
         if sample_interval_s <= 0:
             raise ValueError("sample_interval_s must be > 0")
+        if ring_capacity <= 0:
+            raise ValueError("ring_capacity must be > 0")
+        if max_samples < 2:
+            raise ValueError("max_samples must be >= 2")
+        if realtime_priority is not None and not 1 <= realtime_priority <= 99:
+            raise ValueError("realtime_priority must be in 1..99")
         self.gpu_id = int(gpu_id)
         self.sample_interval_s = float(sample_interval_s)
+        self.isolate_process = bool(isolate_process)
+        self.ring_capacity = int(ring_capacity)
+        self.max_samples = int(max_samples)
+        self.pin_cpu = None if pin_cpu is None else int(pin_cpu)
+        self.realtime_priority = None if realtime_priority is None else int(realtime_priority)
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
-        self.samples: List[EnergySample] = []
+        self._proc: Optional[_RingProcess] = None
+        # Packed 16-byte records (_SAMPLE_DTYPE), one contiguous array doubled on overflow up to max_samples,
+        # plus the running energy (J since the first sample) at each stored record.
+        self._cap = min(1024, self.max_samples)
+        self._n = 0
+        self._rec = np.empty(self._cap, dtype=_SAMPLE_DTYPE)
+        self._cum = np.empty(self._cap, dtype=np.float64)
+        # Samples offered so far; only those with index % _stride == 0 are stored.
+        self._seen = 0
+        self._stride = 1
+        # Running trapezoid integral over every sample, at full precision (not the packed power).
+        self._energy_j = 0.0
+        self._last_t: Optional[float] = None
+        self._last_p = 0.0
+        # True while every append has a non-decreasing t_s (readers can then skip sorting).
+        self._sorted = True
+        self._power_period_s: Optional[float] = None
         self.backend: str = "unknown"
         self.metadata: Dict[str, Any] = {}
 
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def energy_j(self) -> float:
+        """
+        Energy integrated from the first to the latest sample (J).
+        """
+        return self._energy_j
+
+    @property
+    def samples(self) -> List[EnergySample]:
+        """
+        Materialized EnergySample list (built on demand; prefer `columns()` for bulk access).
+        """
+        cols = self.columns()
+        rows = zip(*(cols[name].tolist() for name in _COLUMNS))
+        return [
+            EnergySample(
+                t_s=r[0],
+                power_w=r[1],
+                temp_c=_opt(r[2]),
+                gpu_util_pct=_opt(r[3]),
+                mem_util_pct=_opt(r[4]),
+                mem_used_mb=_opt(r[5]),
+                mem_total_mb=_opt(r[6]),
+            )
+            for r in rows
+        ]
+
+    def columns(self, names: Sequence[str] = _COLUMNS) -> Dict[str, np.ndarray]:
+        """
+        Decoded float64 columns of the collected samples, keyed by EnergySample field name.
+        """
+        rec = self._rec[: self._n]
+        mem_total_mb = self.metadata.get("mem_total_mb")
+        return {name: _decode_column(rec, name, mem_total_mb) for name in names}
+
+    def write_csv(self, path: Union[str, Path]) -> int:
+        """
+        Write every stored sample as CSV (one header line, `nan` for missing values).
+        Formatted straight from the float columns by numpy; no per-value Python objects. Returns rows written.
+        """
+        cols = self.columns()
+        np.savetxt(
+            path,
+            np.column_stack([cols[name] for name in _COLUMNS]),
+            fmt="%.6g",
+            delimiter=",",
+            header=",".join(_COLUMNS),
+            comments="",
+        )
+        return self._n
+
+    def _append(
+        self,
+        t_s: float,
+        power_w: float,
+        temp_c: Optional[float] = None,
+        gpu_util_pct: Optional[float] = None,
+        mem_util_pct: Optional[float] = None,
+        mem_used_mb: Optional[float] = None,
+        mem_total_mb: Optional[float] = None,
+    ) -> None:
+        last_t = self._last_t
+        if last_t is not None:
+            if t_s >= last_t:
+                self._energy_j += 0.5 * (power_w + self._last_p) * (t_s - last_t)
+            else:
+                self._sorted = False
+        self._last_t = t_s
+        self._last_p = power_w
+        if mem_total_mb is not None:
+            self.metadata["mem_total_mb"] = float(mem_total_mb)
+
+        seen = self._seen
+        self._seen = seen + 1
+        if seen % self._stride:
+            return
+        n = self._n
+        if n == self.max_samples:
+            n = self._decimate()
+            if seen % self._stride:
+                return
+        elif n == self._cap:
+            self._reserve(n + 1)
+        self._rec[n] = _encode_sample(t_s, power_w, temp_c, gpu_util_pct, mem_util_pct, mem_used_mb)
+        self._cum[n] = self._energy_j
+        self._n = n + 1
+
+    def _reserve(self, need: int) -> None:
+        if need <= self._cap:
+            return
+        cap = self._cap
+        while cap < need:
+            cap *= 2
+        cap = min(cap, self.max_samples)
+        grown = np.empty(cap, dtype=_SAMPLE_DTYPE)
+        grown[: self._n] = self._rec[: self._n]
+        self._rec = grown
+        cum = np.empty(cap, dtype=np.float64)
+        cum[: self._n] = self._cum[: self._n]
+        self._cum = cum
+        self._cap = cap
+
+    def _decimate(self) -> int:
+        """
+        Keep every other stored record and halve the storage rate from here on. Returns the new count.
+        """
+        n = self._n
+        kept = (n + 1) // 2
+        self._rec[:kept] = self._rec[0:n:2]
+        self._cum[:kept] = self._cum[0:n:2]
+        self._n = kept
+        self._stride *= 2
+        self.metadata["stored_every_nth_sample"] = self._stride
+        return kept
+
+    def _extend(self, recs: np.ndarray) -> None:
+        """
+        Bulk append of packed _SAMPLE_DTYPE records.
+        """
+        k = int(recs.shape[0])
+        if k == 0:
+            return
+        t = recs["t_s"].astype(np.float64)
+        p = _decode_column(recs, "power_w", None)
+        if self._last_t is not None:
+            t_prev = np.concatenate(([self._last_t], t[:-1]))
+            p_prev = np.concatenate(([self._last_p], p[:-1]))
+        else:
+            t_prev = np.concatenate((t[:1], t[:-1]))
+            p_prev = np.concatenate((p[:1], p[:-1]))
+        dt = t - t_prev
+        if bool(np.any(dt < 0.0)):
+            self._sorted = False
+        cum = self._energy_j + np.cumsum(0.5 * (p + p_prev) * np.maximum(dt, 0.0))
+        self._energy_j = float(cum[-1])
+        self._last_t = float(t[-1])
+        self._last_p = float(p[-1])
+
+        idx = np.arange(self._seen, self._seen + k)
+        self._seen += k
+        while True:
+            keep = idx % self._stride == 0
+            m = int(np.count_nonzero(keep))
+            if self._n + m <= self.max_samples:
+                break
+            self._decimate()
+        n = self._n
+        self._reserve(n + m)
+        self._rec[n : n + m] = recs[keep]
+        self._cum[n : n + m] = cum[keep]
+        self._n = n + m
+
+    def _energy_until(self, duration_s: float) -> Optional[float]:
+        """
+        Energy over [0, duration_s] from the running integral (same edge rules as integrate_energy_j):
+        a binary search for the window end instead of a pass over the samples.
+        None if samples arrived out of time order.
+        """
+        if not self._sorted or self._last_t is None or self._n == 0:
+            return None
+        rec = self._rec
+        t_first = float(rec[0]["t_s"])
+        p_first = float(rec[0]["power_dw"]) / 10.0
+        energy = p_first * min(t_first, duration_s) if t_first > 0.0 else 0.0
+        if duration_s <= t_first:
+            return energy
+        t_last = self._last_t
+        if duration_s >= t_last:
+            return energy + self._energy_j + self._last_p * (duration_s - t_last)
+        # Window ends between stored record i and the next sample (stored, or the latest one): interpolate
+        # the running integral linearly between the two. Without decimation they are adjacent samples and
+        # this is exactly integrate_energy_j's clipped trapezoid. After decimation it is still exact at every
+        # stored record; in between, the error is at most the energy of that one stored gap (samples dropped
+        # there are not kept).
+        i = int(np.searchsorted(rec["t_s"][: self._n], duration_s, side="right")) - 1
+        if i + 1 < self._n:
+            t_b = float(rec[i + 1]["t_s"])
+            cum_b = float(self._cum[i + 1])
+        else:
+            t_b = t_last
+            cum_b = self._energy_j
+        t_a = float(rec[i]["t_s"])
+        cum_a = float(self._cum[i])
+        if t_b <= t_a:
+            return energy + cum_a
+        return energy + cum_a + (cum_b - cum_a) * (min(duration_s, t_b) - t_a) / (t_b - t_a)
+
     def start(self) -> None:
-        if self._thread is not None:
+        if self._thread is not None or self._proc is not None:
             raise RuntimeError("EnergySampler already started")
+        if self.isolate_process:
+            self._proc = _RingProcess(self)
+            return
         self._stop.clear()
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
+        if self._proc is not None:
+            self._proc.finish(self)
+            self._proc = None
+            return
         if self._thread is None:
             return
         self._stop.set()
-        self._thread.join(timeout=5.0)
+        # NVML ticks and calibration wake on the stop event immediately, the nvidia-smi stream after at most
+        # one line; the generous bound only matters while nvmlInit / a first nvidia-smi attach is still running.
+        self._thread.join(timeout=_STOP_JOIN_TIMEOUT_S + 2.0 * self.sample_interval_s)
+        if self._thread.is_alive():
+            # Still writing samples: keep the handle and flag the receipt instead of reporting a clean stop.
+            self.metadata["stop_timeout"] = True
+            return
         self._thread = None
 
+    def _apply_sched(self) -> None:
+        """
+        Apply the opt-in CPU pinning / SCHED_FIFO to the calling (sampling) thread. Best effort:
+        on Linux pid 0 addresses the calling thread only, so the workload is unaffected.
+        """
+        info: Dict[str, Any] = {}
+        if self.pin_cpu is not None:
+            try:
+                os.sched_setaffinity(0, {self.pin_cpu})
+                info["pin_cpu"] = self.pin_cpu
+            except (AttributeError, OSError, ValueError) as e:
+                info["pin_cpu_error"] = f"{type(e).__name__}: {e}"
+        if self.realtime_priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.realtime_priority))
+                info["policy"] = "SCHED_FIFO"
+                info["priority"] = self.realtime_priority
+            except PermissionError:
+                info["policy_error"] = "SCHED_FIFO needs CAP_SYS_NICE; kept default policy"
+            except (AttributeError, OSError) as e:
+                info["policy_error"] = f"{type(e).__name__}: {e}"
+        if info:
+            self.metadata["sampler_sched"] = info
+
+    def _nvml_snapshot(self, pynvml: Any, h: Any) -> Callable[[], _Snapshot]:
+        """
+        Build the per-tick NVML reader: a closure over bound entry points (fast locals, no module
+        attribute lookups) returning one `_Snapshot` row. Power errors propagate; the rest degrade to None.
+        """
+        get_power = pynvml.nvmlDeviceGetPowerUsage
+        get_temp = pynvml.nvmlDeviceGetTemperature
+        get_util = pynvml.nvmlDeviceGetUtilizationRates
+        get_mem = pynvml.nvmlDeviceGetMemoryInfo
+        TEMP_GPU = pynvml.NVML_TEMPERATURE_GPU
+        MIB = 1024.0 * 1024.0
+
+        # Power always comes from nvmlDeviceGetPowerUsage (a ~1 s average on A100/H100, instantaneous on older
+        # parts), so energy_j keeps one meaning across hosts. NVML has no field ids for GPU temperature or
+        # utilization, so nvmlDeviceGetFieldValues could not batch these reads anyway.
+        self.metadata["power_source"] = "nvmlDeviceGetPowerUsage"
+
+        def snapshot() -> _Snapshot:
+            p_w = float(get_power(h)) / 1000.0
+            try:
+                temp_c: Optional[float] = float(get_temp(h, TEMP_GPU))
+            except Exception:
+                temp_c = None
+            try:
+                util = get_util(h)
+                gpu_util: Optional[float] = float(util.gpu)
+                mem_util: Optional[float] = float(util.memory)
+            except Exception:
+                gpu_util = None
+                mem_util = None
+            try:
+                mem = get_mem(h)
+                mem_used_mb: Optional[float] = float(mem.used) / MIB
+                mem_total_mb: Optional[float] = float(mem.total) / MIB
+            except Exception:
+                mem_used_mb = None
+                mem_total_mb = None
+            return p_w, temp_c, gpu_util, mem_util, mem_used_mb, mem_total_mb
+
+        return snapshot
+
     def _run(self) -> None:
+        self._apply_sched()
         t0 = time.perf_counter()
 
         # Prefer NVML for higher-rate sampling.
         try:
-            import pynvml  # type: ignore
+            pynvml, binding = _load_nvml()
 
             pynvml.nvmlInit()
             h = pynvml.nvmlDeviceGetHandleByIndex(self.gpu_id)
             self.backend = "nvml"
+            self.metadata["nvml_binding"] = binding
+
+            # Without persistence mode the driver may tear down and re-init GPU state between
+            # clients, adding latency spikes to the very reads being timed.
+            try:
+                persistent = bool(pynvml.nvmlDeviceGetPersistenceMode(h))
+                self.metadata["persistence_mode"] = persistent
+                if not persistent:
+                    warnings.warn(
+                        f"GPU {self.gpu_id}: persistence mode is disabled; enable it (nvidia-smi -pm 1) for stable sampling",
+                        RuntimeWarning,
+                    )
+            except Exception:
+                pass
 
             try:
                 self.metadata["power_limit_w"] = float(pynvml.nvmlDeviceGetPowerManagementLimit(h)) / 1000.0
@@ -202,83 +935,217 @@ class EnergySampler:
             except Exception:
                 pass
 
-            # Always take at least one sample immediately.
+            snapshot = self._nvml_snapshot(pynvml, h)
+            perf = time.perf_counter
+            append = self._append
+            stop_wait = self._stop.wait
+            is_stopped = self._stop.is_set
+
+            # Always take at least one (full) sample immediately.
             try:
-                p_w0 = float(pynvml.nvmlDeviceGetPowerUsage(h)) / 1000.0
-                self.samples.append(EnergySample(t_s=0.0, power_w=float(p_w0)))
+                append(perf() - t0, *snapshot())
             except Exception:
                 pass
 
-            while not self._stop.is_set():
-                t = time.perf_counter() - t0
-                p_w = float(pynvml.nvmlDeviceGetPowerUsage(h)) / 1000.0
-                try:
-                    temp_c = float(pynvml.nvmlDeviceGetTemperature(h, pynvml.NVML_TEMPERATURE_GPU))
-                except Exception:
-                    temp_c = None
-                try:
-                    util = pynvml.nvmlDeviceGetUtilizationRates(h)
-                    gpu_util = float(util.gpu)
-                    mem_util = float(util.memory)
-                except Exception:
-                    gpu_util = None
-                    mem_util = None
+            interval = self.sample_interval_s
+            if interval < _POWER_PERIOD_PROBE_BELOW_S:
+                # Calibration reads are full samples (stored), so the workload start is not a gap in the record.
+                def read_power() -> float:
+                    now = perf()
+                    snap = snapshot()
+                    append(now - t0, *snap)
+                    return snap[0]
+
                 try:
-                    mem = pynvml.nvmlDeviceGetMemoryInfo(h)
-                    mem_used_mb = float(mem.used) / (1024.0 * 1024.0)
-                    mem_total_mb = float(mem.total) / (1024.0 * 1024.0)
+                    self._power_period_s = _calibrate_power_period(read_power, stop_wait)
                 except Exception:
-                    mem_used_mb = None
-                    mem_total_mb = None
-
-                self.samples.append(
-                    EnergySample(
-                        t_s=float(t),
-                        power_w=float(p_w),
-                        temp_c=temp_c,
-                        gpu_util_pct=gpu_util,
-                        mem_util_pct=mem_util,
-                        mem_used_mb=mem_used_mb,
-                        mem_total_mb=mem_total_mb,
-                    )
-                )
-                time.sleep(self.sample_interval_s)
+                    self._power_period_s = None
+                if self._power_period_s is not None:
+                    self.metadata["power_update_period_s"] = self._power_period_s
+            period = self._power_period_s
+
+            # Absolute deadlines (t0 + k*interval): query latency does not accumulate as drift,
+            # and stop() interrupts the wait instead of sleeping out the interval.
+            # With a known power period, a tick is stored only when power changed or a period has passed
+            # since the last stored one. The last skipped tick is stored before a change, so the trapezoid
+            # over the stored samples equals the one over every tick.
+            k = 0
+            last_p: Optional[float] = None
+            kept_t = float("-inf")
+            held: Optional[Tuple[float, _Snapshot]] = None
+            while not is_stopped():
+                now = perf()
+                t = now - t0
+                snap = snapshot()
+                if period is None:
+                    append(t, *snap)
+                elif snap[0] != last_p or t - kept_t >= period:
+                    if held is not None and snap[0] != last_p:
+                        append(held[0], *held[1])
+                    append(t, *snap)
+                    last_p = snap[0]
+                    kept_t = t
+                    held = None
+                else:
+                    held = (t, snap)
+
+                # Next tick strictly after `now`; ticks missed by a slow query are skipped, not bunched.
+                k = max(k + 1, int((now - t0) / interval) + 1)
+                if stop_wait(timeout=max(0.0, t0 + k * interval - perf())):
+                    break
+            if held is not None:
+                append(held[0], *held[1])
             return
         except ImportError:
             self.backend = "nvidia-smi"
         except Exception:
             self.backend = "nvidia-smi"
 
-        # Fallback: nvidia-smi polling
-        s0 = _nvidia_smi_sample(self.gpu_id)
-        if s0 is not None:
-            self.samples.append(
-                EnergySample(
-                    t_s=0.0,
-                    power_w=float(s0.power_w),
-                    temp_c=s0.temp_c,
-                    gpu_util_pct=s0.gpu_util_pct,
-                    mem_util_pct=s0.mem_util_pct,
-                    mem_used_mb=s0.mem_used_mb,
-                    mem_total_mb=s0.mem_total_mb,
-                )
-            )
+        # Fallback: one streaming nvidia-smi process (-lms) instead of a fork per sample.
+        self.metadata["power_source"] = "nvidia-smi power.draw"
+        self.metadata["note"] = "nvidia-smi fallback; enable persistence mode (nvidia-smi -pm 1) to avoid driver re-init latency"
+        interval_ms = int(round(self.sample_interval_s * 1000.0))
+        stream = _nvidia_smi_stream(self.gpu_id, interval_ms)
+        try:
+            for row in stream:
+                self._append(time.perf_counter() - t0, *_smi_snapshot(row))
+                if self._stop.is_set():
+                    break
+        finally:
+            stream.close()
 
-        while not self._stop.is_set():
-            t = time.perf_counter() - t0
-            s = _nvidia_smi_sample(self.gpu_id)
-            if s is not None:
-                self.samples.append(
-                    EnergySample(
-                        t_s=float(t),
-                        power_w=float(s.power_w),
-                        temp_c=s.temp_c,
-                        gpu_util_pct=s.gpu_util_pct,
-                        mem_util_pct=s.mem_util_pct,
-                        mem_used_mb=s.mem_used_mb,
-                        mem_total_mb=s.mem_total_mb,
-                    )
-                )
-            time.sleep(self.sample_interval_s)
 
+# Shared-memory ring record: the same 16-byte packed sample the sampler stores,
+# so four records fill a 64 B cache line exactly and none straddles two.
+_RING_DTYPE = _SAMPLE_DTYPE
+
+
+class _RingWriter(EnergySampler):
+    """
+    Child-process side: the regular sampling loop, but each sample goes into the ring.
+
+    Single producer / single consumer without locks: the record is written first, then the
+    8-byte head counter is published. The parent only reads after joining this process, and
+    process exit orders every write before that read.
+    """
+
+    def __init__(
+        self,
+        gpu_id: int,
+        sample_interval_s: float,
+        ring: np.ndarray,
+        head: Any,
+        ready: Any,
+        pin_cpu: Optional[int] = None,
+        realtime_priority: Optional[int] = None,
+    ):
+        super().__init__(gpu_id, sample_interval_s, pin_cpu=pin_cpu, realtime_priority=realtime_priority)
+        self._ring = ring
+        self._head = head
+        self._ready = ready
 
+    def _append(
+        self,
+        t_s: float,
+        power_w: float,
+        temp_c: Optional[float] = None,
+        gpu_util_pct: Optional[float] = None,
+        mem_util_pct: Optional[float] = None,
+        mem_used_mb: Optional[float] = None,
+        mem_total_mb: Optional[float] = None,
+    ) -> None:
+        n = self._head.value
+        self._ring[n % self._ring.shape[0]] = _encode_sample(t_s, power_w, temp_c, gpu_util_pct, mem_util_pct, mem_used_mb)
+        if mem_total_mb is not None:
+            self.metadata["mem_total_mb"] = float(mem_total_mb)
+        self._head.value = n + 1
+        if n == 0:
+            self._ready.set()
+
+
+def _ring_sampler_main(
+    gpu_id: int,
+    sample_interval_s: float,
+    shm_name: str,
+    capacity: int,
+    head: Any,
+    stop: Any,
+    ready: Any,
+    results: Any,
+    pin_cpu: Optional[int] = None,
+    realtime_priority: Optional[int] = None,
+) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        ring = np.ndarray((capacity,), dtype=_RING_DTYPE, buffer=shm.buf)
+        w = _RingWriter(gpu_id, sample_interval_s, ring, head, ready, pin_cpu, realtime_priority)
+        w._stop = stop
+        try:
+            w._run()
+        finally:
+            ready.set()
+            results.put((w.backend, w.metadata))
+            del ring
+    finally:
+        shm.close()
+
+
+class _RingProcess:
+    """
+    Parent side of EnergySampler(isolate_process=True): owns the child process and the ring.
+    """
+
+    def __init__(self, sampler: EnergySampler):
+        ctx = multiprocessing.get_context("spawn")  # never fork a process that may hold NVML state
+        cap = sampler.ring_capacity
+        self.shm = shared_memory.SharedMemory(create=True, size=cap * _RING_DTYPE.itemsize)
+        self.head = ctx.Value("Q", 0, lock=False)
+        self.stop = ctx.Event()
+        ready = ctx.Event()
+        self.results = ctx.Queue()
+        self.proc = ctx.Process(
+            target=_ring_sampler_main,
+            args=(
+                sampler.gpu_id,
+                sampler.sample_interval_s,
+                self.shm.name,
+                cap,
+                self.head,
+                self.stop,
+                ready,
+                self.results,
+                sampler.pin_cpu,
+                sampler.realtime_priority,
+            ),
+            daemon=True,
+        )
+        self.proc.start()
+        # Like the thread backend, return once sampling is live so the measured window starts with data.
+        ready.wait(timeout=30.0)
+
+    def finish(self, sampler: EnergySampler) -> None:
+        self.stop.set()
+        self.proc.join(timeout=max(5.0, 2.0 * sampler.sample_interval_s))
+        if self.proc.is_alive():
+            self.proc.terminate()
+            self.proc.join(timeout=1.0)
+        try:
+            sampler.backend, md = self.results.get(timeout=1.0)
+            sampler.metadata.update(md)
+        except Exception:
+            pass
+        try:
+            n = int(self.head.value)
+            cap = sampler.ring_capacity
+            ring = np.ndarray((cap,), dtype=_RING_DTYPE, buffer=self.shm.buf)
+            if n > cap:
+                start = n % cap
+                recs = np.concatenate((ring[start:], ring[:start]))
+                sampler.metadata["ring_dropped"] = n - cap
+            else:
+                recs = ring[:n].copy()
+            del ring
+            sampler._extend(recs)
+        finally:
+            self.shm.close()
+            self.shm.unlink()
@@ -17,26 +17,83 @@ Hard rules:
 from __future__ import annotations
 
 import argparse
+import bisect
+import ctypes
+import functools
 import hashlib
 import json
 import os
 import platform
+import shutil
 import subprocess
+import sys
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit, prange  # type: ignore
+except ImportError:
+    njit = None
+    prange = range
+
 
 def _sha256_hex(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
+    # Streamed: artifacts like truth.json can be tens of MB, no need to hold a second copy in memory.
+    with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+# Artifacts covered by receipt_hashes.json, in hashing order (large results.json right after it is written).
+_HASHED_ARTIFACTS = (
+    "scenario.json",
+    "dataset_spec.json",
+    "environment.json",
+    "truth.json",
+    "results.json",
+    "receipt_energy.json",
+    "receipt_energy_samples.csv",
+    "nvidia_smi_before.txt",
+    "nvidia_smi_after.txt",
+    "nvidia_smi_snapshot.txt",
+)
+
+
+def _json_default(obj: Any) -> Any:
+    # numpy values for the stdlib encoder (orjson serializes them natively); NaN -> null like orjson.
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "f":
+            nan = np.isnan(obj)
+            if nan.any():
+                return np.where(nan, None, obj).tolist()
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 def _write_json(path: Path, obj: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+    if orjson is not None:
+        try:
+            path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            return
+        except TypeError:
+            pass  # e.g. non-str keys or >64-bit ints: let the stdlib encoder handle it
+    path.write_text(json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default), encoding="utf-8")
 
 def _write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -68,22 +125,16 @@ def _nvidia_smi_snapshot() -> Tuple[bool, str]:
         return False, f"nvidia-smi exception: {e}"
 
 
-def _pct(samples: List[float], p: float) -> float:
-    if not samples:
-        return 0.0
-    return float(np.percentile(np.asarray(samples, dtype=np.float64), p))
-
-
-def _latency_stats_ms(lat_ms: List[float]) -> Dict[str, float]:
-    if not lat_ms:
+def _latency_stats_ms(lat_ms: np.ndarray) -> Dict[str, float]:
+    if lat_ms.shape[0] == 0:
         return {"avg": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
-    a = np.asarray(lat_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(lat_ms, [50, 95, 99]).tolist()
     return {
-        "avg": float(a.mean()),
-        "p50": _pct(lat_ms, 50),
-        "p95": _pct(lat_ms, 95),
-        "p99": _pct(lat_ms, 99),
-        "max": float(a.max()),
+        "avg": float(lat_ms.mean()),
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "max": float(lat_ms.max()),
     }
 
 
@@ -110,6 +161,410 @@ def _naive_lcp_top1(query: str, candidates: List[str], *, max_len: int) -> Tuple
     return best_idx, int(best_lcp)
 
 
+def _lcp_row_width(max_len: int) -> int:
+    """
+    Encoded row width: max_len rounded up to whole 64-bit words (8 one-byte chars), so rows can be
+    compared a word at a time. The extra columns are zero padding and never count (lengths cap the LCP).
+    """
+    return -(-int(max_len) // 8) * 8
+
+
+# Code for query chars that occur in no path: equal to no row char, so it always ends the LCP.
+_U8_UNKNOWN = 0xFF
+
+
+def _u8_char_codes(mat_u16: np.ndarray) -> Optional[np.ndarray]:
+    """
+    One-byte code per distinct char of the encoded paths, as a 64K lookup table (uint16 -> uint8), or
+    None when there are more than 254 of them.
+
+    The scan is memory-bound (N=200k rows x L=128 uint16 = 51 MB per query, past L2 and close to L3),
+    so halving the row bytes matters more than the compare. Paths are not ASCII (" → " separators), but
+    their alphabet is tiny: codes 1..254 keep char equality exact, 0 stays padding (as in uint16) and
+    `_U8_UNKNOWN` marks query chars no path contains.
+    """
+    chars = np.unique(mat_u16)
+    chars = chars[chars != 0]
+    if chars.shape[0] > _U8_UNKNOWN - 1:
+        return None
+    lut = np.full(1 << 16, _U8_UNKNOWN, dtype=np.uint8)
+    lut[0] = 0
+    lut[chars] = np.arange(1, chars.shape[0] + 1, dtype=np.uint8)
+    return lut
+
+
+def _lcp_top1_vectorized(
+    q_row: np.ndarray, q_len: int, mat: np.ndarray, lens: np.ndarray
+) -> Tuple[int, int]:
+    """
+    Same answer as `_naive_lcp_top1`, as one whole-matrix compare instead of a Python loop per candidate.
+
+    q_row / mat: padded encodings (uint8 codes or uint16), `_lcp_row_width` wide; q_len / lens: true
+    lengths capped at max_len, so padding never counts as a match. Ties resolve to the lowest index,
+    as in the scan.
+    """
+    neq = mat != q_row
+    lcp = neq.argmax(axis=1)
+    lcp[~neq.any(axis=1)] = mat.shape[1]
+    np.minimum(lcp, lens, out=lcp)
+    np.minimum(lcp, q_len, out=lcp)
+    best = int(lcp.argmax())
+    return best, int(lcp[best])
+
+
+# Upper bound on (queries x candidates x chars) compared per step in `_lcp_top1_batch_vectorized`.
+_BATCH_ELEMS = 1 << 24
+
+
+def _lcp_top1_batch_vectorized(
+    q_mat: np.ndarray, q_lens: np.ndarray, mat: np.ndarray, lens: np.ndarray
+) -> np.ndarray:
+    """
+    `_lcp_top1_vectorized` for Q queries at once: (Q, width) queries against the (N, width) matrix
+    by broadcasting, in query chunks that keep the (q, N, width) temporaries under `_BATCH_ELEMS`.
+    Returns the (Q,) best indices.
+    """
+    nq = q_mat.shape[0]
+    n, width = mat.shape
+    out = np.zeros(nq, dtype=np.int64)
+    if n == 0:
+        return out
+    step = max(1, _BATCH_ELEMS // (n * width))
+    for lo in range(0, nq, step):
+        neq = mat[None, :, :] != q_mat[lo : lo + step, None, :]
+        lcp = neq.argmax(axis=2)
+        lcp[~neq.any(axis=2)] = width
+        np.minimum(lcp, lens[None, :], out=lcp)
+        np.minimum(lcp, q_lens[lo : lo + step, None], out=lcp)
+        out[lo : lo + step] = lcp.argmax(axis=1)
+    return out
+
+
+def _lcp_top1_scan_py(mat_u64: np.ndarray, lens: np.ndarray, q_u64: np.ndarray, q_len: int) -> Tuple[int, int]:
+    """
+    Kernel form of `_lcp_top1_vectorized` for numba: per-row early-exit compare (rows in parallel),
+    then a first-max reduction. No (N, L) temporaries.
+
+    SWAR: rows are uint64 words of 8 one-byte char codes (little-endian); XOR-ing a word with the
+    query's is zero iff all 8 match, and the lowest non-zero byte of the XOR is the first mismatch.
+    """
+    n, words = mat_u64.shape
+    out = np.empty(n, dtype=np.int64)
+    for i in prange(n):
+        lim = min(lens[i], q_len)
+        j = words * 8
+        for w in range((lim + 7) // 8):
+            d = mat_u64[i, w] ^ q_u64[w]
+            if d != 0:
+                j = w * 8
+                while (d & 0xFF) == 0:
+                    d >>= 8
+                    j += 1
+                break
+        out[i] = min(j, lim)
+    best = 0
+    for i in range(1, n):
+        if out[i] > out[best]:
+            best = i
+    return best, out[best]
+
+
+def _lcp_top1_batch_scan_py(mat_u64: np.ndarray, lens: np.ndarray, q_u64: np.ndarray, q_lens: np.ndarray) -> np.ndarray:
+    """
+    Batch form of `_lcp_top1_scan_py` for numba: queries in parallel, each a serial scan that skips
+    rows whose length cap cannot beat the current best. Returns the (Q,) best indices.
+    """
+    nq = q_u64.shape[0]
+    n, words = mat_u64.shape
+    out = np.zeros(nq, dtype=np.int64)
+    for k in prange(nq):
+        best = 0
+        best_lcp = -1
+        for i in range(n):
+            lim = min(lens[i], q_lens[k])
+            if lim <= best_lcp:
+                continue
+            j = words * 8
+            for w in range((lim + 7) // 8):
+                d = mat_u64[i, w] ^ q_u64[k, w]
+                if d != 0:
+                    j = w * 8
+                    while (d & 0xFF) == 0:
+                        d >>= 8
+                        j += 1
+                    break
+            j = min(j, lim)
+            if j > best_lcp:
+                best_lcp = j
+                best = i
+        out[k] = best
+    return out
+
+
+if njit is not None and sys.byteorder == "little":
+    try:
+        _lcp_top1_nb = njit(parallel=True, cache=True)(_lcp_top1_scan_py)
+        _lcp_top1_batch_nb = njit(parallel=True, cache=True)(_lcp_top1_batch_scan_py)
+    except Exception:  # pragma: no cover - broken numba install
+        _lcp_top1_nb = _lcp_top1_batch_nb = None
+else:
+    _lcp_top1_nb = _lcp_top1_batch_nb = None
+
+
+class _RadixNode:
+    """
+    Compressed-trie node: edges keyed by first char -> [label, child]; min_idx is the lowest path
+    index in this subtree (the scan's tie-break winner for any query whose LCP ends here).
+    """
+
+    __slots__ = ("edges", "min_idx")
+
+    def __init__(self, min_idx: int):
+        self.edges: Dict[str, List[Any]] = {}
+        self.min_idx = min_idx
+
+
+def _build_prefix_trie(paths: List[str], *, max_len: int) -> _RadixNode:
+    """
+    Radix trie over the max_len-truncated paths, edges labelled with whole substrings (not chars).
+    Paths are inserted in index order, so every node's min_idx is the first path that reached it.
+    """
+    root = _RadixNode(0)
+    for i, p in enumerate(paths):
+        k = p[:max_len]
+        node = root
+        pos = 0
+        n = len(k)
+        while pos < n:
+            e = node.edges.get(k[pos])
+            if e is None:
+                node.edges[k[pos]] = [k[pos:], _RadixNode(i)]
+                break
+            label, child = e
+            if k.startswith(label, pos):
+                node = child
+                pos += len(label)
+                continue
+            # Split the edge at the first differing char.
+            m = 1
+            while m < len(label) and pos + m < n and label[m] == k[pos + m]:
+                m += 1
+            mid = _RadixNode(child.min_idx)
+            mid.edges[label[m]] = [label[m:], child]
+            e[0] = label[:m]
+            e[1] = mid
+            if pos + m < n:
+                mid.edges[k[pos + m]] = [k[pos + m :], _RadixNode(i)]
+            break
+    return root
+
+
+def _trie_lcp_top1(root: _RadixNode, query: str, *, max_len: int) -> int:
+    """
+    Same index as `_naive_lcp_top1`, by descending the trie: O(len(query)) instead of O(N * L).
+    Where the query diverges (or ends) the LCP is maximal, and the subtree's min_idx breaks ties.
+    """
+    q = query[:max_len]
+    node = root
+    pos = 0
+    n = len(q)
+    while pos < n:
+        e = node.edges.get(q[pos])
+        if e is None:
+            break
+        label, child = e
+        if not q.startswith(label, pos):
+            return child.min_idx
+        node = child
+        pos += len(label)
+    return node.min_idx
+
+
+def _sparse_table_min(a: np.ndarray) -> List[np.ndarray]:
+    """
+    Sparse table for O(1) range-min: level k holds min(a[i : i + 2**k]).
+    """
+    table = [a]
+    k = 1
+    while (1 << k) <= a.shape[0]:
+        prev = table[-1]
+        half = 1 << (k - 1)
+        table.append(np.minimum(prev[:-half], prev[half:]))
+        k += 1
+    return table
+
+
+def _range_min(table: List[np.ndarray], lo: int, hi: int) -> int:
+    """
+    min(a[lo : hi + 1]) for a non-empty inclusive range.
+    """
+    k = (hi - lo + 1).bit_length() - 1
+    level = table[k]
+    return int(min(level[lo], level[hi - (1 << k) + 1]))
+
+
+class _SortedLcpIndex:
+    """
+    Lexicographically sorted (max_len-truncated) paths + LCP of sorted neighbours (Manber-Myers style).
+
+    The best LCP against a query is reached at one of the two sorted neighbours of its insertion
+    point; every path sharing that many chars with it forms a contiguous sorted range, found by
+    binary search over range-min of the neighbour LCPs. A range-min over original indices then
+    applies the scan's tie-break. Per query: O(len(q) + log N), and the same index as `_naive_lcp_top1`.
+    """
+
+    def __init__(self, paths: List[str], paths_mat: np.ndarray, lens: np.ndarray, *, max_len: int):
+        self.max_len = int(max_len)
+        keys = [p[: self.max_len] for p in paths]
+        order = np.array(sorted(range(len(keys)), key=keys.__getitem__), dtype=np.int64)
+        self.keys = [keys[i] for i in order]
+        # neigh[i] = LCP(keys[i - 1], keys[i]), vectorized over the pre-encoded rows.
+        rows = paths_mat[order]
+        neq = rows[1:] != rows[:-1]
+        first = neq.argmax(axis=1)
+        first[~neq.any(axis=1)] = rows.shape[1]
+        sl = lens[order]
+        neigh = np.zeros(len(keys), dtype=np.int64)
+        if len(keys) > 1:
+            neigh[1:] = np.minimum(first, np.minimum(sl[1:], sl[:-1]))
+        self.neigh_min = _sparse_table_min(neigh)
+        self.orig_min = _sparse_table_min(order)
+
+    def top1(self, query: str) -> int:
+        keys = self.keys
+        n = len(keys)
+        q = query[: self.max_len]
+        p = bisect.bisect_left(keys, q)
+        best = -1
+        c = 0
+        for j in (p - 1, p):
+            if 0 <= j < n:
+                l = _lcp_len(q, keys[j], max_len=self.max_len)
+                if l > best:
+                    best, c = l, j
+        # Widest [a, b] around c whose consecutive LCPs all stay >= best.
+        lo, hi = 0, c
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _range_min(self.neigh_min, mid + 1, c) >= best:
+                hi = mid
+            else:
+                lo = mid + 1
+        a = lo
+        lo, hi = c, n - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if _range_min(self.neigh_min, c + 1, mid) >= best:
+                lo = mid
+            else:
+                hi = mid - 1
+        return _range_min(self.orig_min, a, lo)
+
+
+def _exact_lcp_top1_index(paths: List[str], *, max_len: int) -> Dict[str, int]:
+    """
+    Map each (max_len-truncated) path to the index `_naive_lcp_top1` returns for it as a query.
+
+    Queried with its own path, the scan's best LCP is the full key, reached by every path that starts
+    with that key; the scan keeps the lowest such index (not necessarily the exact row). In sorted
+    order those paths form a contiguous run after the key, so one pass with a stack of open prefixes
+    folds the minimum index up to each key.
+    """
+    keys = [p[:max_len] for p in paths]
+    out: Dict[str, int] = {}
+    stack: List[List[Any]] = []  # [key, min index over the key and its extensions]
+
+    def _close() -> None:
+        k, m = stack.pop()
+        out[k] = m
+        if stack and m < stack[-1][1]:
+            stack[-1][1] = m
+
+    for i in sorted(range(len(keys)), key=keys.__getitem__):
+        k = keys[i]
+        while stack and not k.startswith(stack[-1][0]):
+            _close()
+        if stack and stack[-1][0] == k:
+            if i < stack[-1][1]:
+                stack[-1][1] = i
+        else:
+            stack.append([k, i])
+    while stack:
+        _close()
+    return out
+
+
+_LCP_EXT_SRC = Path(__file__).with_name("_lcp_ext.c")
+
+
+def _load_lcp_ext(width: Optional[int] = None) -> Optional[Tuple[Any, Any, str]]:
+    """
+    ctypes binding to the optional C scan (`_lcp_ext.c`), built next to its source on first use
+    (or when the source is newer). Returns (lcp_top1, lcp_top1_batch, kernel label), or None when
+    there is no compiler / the build fails.
+
+    With `width`, builds (and caches as `_lcp_ext_w<width>.so`) a copy specialized to that row width:
+    the trip count is a compile-time constant and the compare loop is fully unrolled. Its functions
+    must only be called with rows of exactly that width.
+    """
+    if width is None:
+        so, defines = _LCP_EXT_SRC.with_suffix(".so"), []
+    else:
+        so, defines = _LCP_EXT_SRC.with_name(f"{_LCP_EXT_SRC.stem}_w{int(width)}.so"), [f"-DLCP_WIDTH={int(width)}"]
+    try:
+        if not so.exists() or so.stat().st_mtime < _LCP_EXT_SRC.stat().st_mtime:
+            cc = os.environ.get("CC") or shutil.which("cc") or shutil.which("gcc")
+            if cc is None:
+                return None
+            tmp = so.with_name(f"{so.stem}.{os.getpid()}.so")
+            # -march=native picks up AVX2 on x86; NEON is baseline on aarch64, where some
+            # compilers only accept -mcpu=native (or neither).
+            for arch in (["-march=native"], ["-mcpu=native"], []):
+                build = subprocess.run(
+                    [cc, "-O3", *arch, *defines, "-shared", "-fPIC", "-o", str(tmp), str(_LCP_EXT_SRC)],
+                    capture_output=True,
+                    timeout=120,
+                )
+                if build.returncode == 0:
+                    break
+            else:
+                return None
+            os.replace(tmp, so)
+        lib = ctypes.CDLL(str(so))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    fn = lib.lcp_top1
+    fn.argtypes = [
+        ctypes.c_void_p,  # mat (N, width) uint8 codes
+        ctypes.c_int64,  # N
+        ctypes.c_int64,  # width
+        ctypes.c_void_p,  # lens (N,) int64
+        ctypes.c_void_p,  # q (width,) uint8 codes
+        ctypes.c_int64,  # q_len
+        ctypes.POINTER(ctypes.c_int64),  # best lcp (out)
+    ]
+    fn.restype = ctypes.c_int64
+    batch_fn = lib.lcp_top1_batch
+    batch_fn.argtypes = [
+        ctypes.c_void_p,  # mat (N, width) uint8 codes
+        ctypes.c_int64,  # N
+        ctypes.c_int64,  # width
+        ctypes.c_void_p,  # lens (N,) int64
+        ctypes.c_void_p,  # queries (Q, width) uint8 codes
+        ctypes.c_void_p,  # query lengths (Q,) int64
+        ctypes.c_int64,  # Q
+        ctypes.c_void_p,  # best indices (Q,) int64 (out)
+    ]
+    batch_fn.restype = None
+    label = {32: "c_avx2", 16: "c_neon"}.get(lib.lcp_simd_chars(), "c")
+    lib.lcp_row_width.restype = ctypes.c_int64
+    if width is not None:
+        if lib.lcp_row_width() != int(width):
+            return None
+        label += f"_w{int(width)}"
+    return fn, batch_fn, label
+
+
 def _make_path(i: int, *, depth: int, fanout: int) -> str:
     """
     Procedural hierarchical key with high prefix collisions.
@@ -124,38 +579,53 @@ def _make_path(i: int, *, depth: int, fanout: int) -> str:
     return " → ".join(parts)
 
 
-def _make_edges(i: int, *, n_docs: int) -> Dict[str, int]:
+@dataclass(frozen=True)
+class DocTable:
     """
-    Deterministic "cross references" to simulate interlinked documents.
+    Per-document columns, indexed by path row: doc id plus two deterministic "cross references"
+    (ref_a, ref_b) simulating interlinked documents. Three int64 arrays instead of a dict per doc.
     """
-    # Two references per doc. This is not a semantics benchmark; it's a structured retrieval workload.
-    return {
-        "ref_a": int((i * 1315423911) % n_docs),
-        "ref_b": int((i * 2654435761) % n_docs),
-    }
 
+    doc_id: np.ndarray
+    ref_a: np.ndarray
+    ref_b: np.ndarray
 
-@dataclass(frozen=True)
-class QueryTask:
+    def contents(self) -> List[Dict[str, Any]]:
+        # Dict form, for stores that keep an opaque payload per key (DHM); one tolist() per column.
+        return [
+            {"doc_id": doc_id, "edges": {"ref_a": ref_a, "ref_b": ref_b}}
+            for doc_id, ref_a, ref_b in zip(self.doc_id.tolist(), self.ref_a.tolist(), self.ref_b.tolist())
+        ]
+
+
+class QueryTask(NamedTuple):
+    # A tuple rather than a dataclass: smaller per query, and field reads are plain item lookups.
     qid: int
     doc_id: int
     query: str
     expect_path: str
     chain: Tuple[int, int, int]  # (doc_id, ref_a, ref_b)
+    expect_idx: int  # row of expect_path in paths / DocTable
 
 
-def _build_dataset(*, seed: int, n_docs: int, depth: int, fanout: int) -> Tuple[List[str], List[Dict[str, Any]]]:
+def _build_dataset(*, seed: int, n_docs: int, depth: int, fanout: int) -> Tuple[List[str], DocTable]:
     # Deterministic: only depends on seed/n_docs/depth/fanout
     rng = np.random.RandomState(seed)
     order = np.arange(n_docs, dtype=np.int64)
     rng.shuffle(order)
-    paths: List[str] = []
-    contents: List[Dict[str, Any]] = []
-    for idx, doc_id in enumerate(order.tolist()):
-        p = _make_path(doc_id, depth=depth, fanout=fanout)
-        paths.append(p)
-        contents.append({"doc_id": int(doc_id), "edges": _make_edges(int(doc_id), n_docs=n_docs)})
-    return paths, contents
+    paths = [_make_path(doc_id, depth=depth, fanout=fanout) for doc_id in order.tolist()]
+    # Two references per doc. This is not a semantics benchmark; it's a structured retrieval workload.
+    # int64 products are exact for n_docs < 2**63 / 2654435761 (~3.4e9).
+    docs = DocTable(
+        doc_id=order,
+        ref_a=(order * 1315423911) % max(1, n_docs),
+        ref_b=(order * 2654435761) % max(1, n_docs),
+    )
+    return paths, docs
+
+
+def _hot_set_size(n_docs: int, repeat_pct: float) -> int:
+    return max(1, int(max(1, n_docs) * max(0.0001, min(0.01, repeat_pct))))
 
 
 def _build_queries(
@@ -164,33 +634,26 @@ def _build_queries(
     n_queries: int,
     repeat_pct: float,
     paths: List[str],
-    contents: List[Dict[str, Any]],
+    docs: DocTable,
 ) -> List[QueryTask]:
     rng = np.random.RandomState(seed + 1)
     n_docs = len(paths)
 
     # Choose a small "hot set" to enable memoization.
-    hot_k = max(1, int(max(1, n_docs) * max(0.0001, min(0.01, repeat_pct))))
+    hot_k = _hot_set_size(n_docs, repeat_pct)
     hot_ids = rng.choice(n_docs, size=hot_k, replace=False)
 
-    tasks: List[QueryTask] = []
-    for qid in range(n_queries):
-        if rng.rand() < repeat_pct:
-            idx = int(rng.choice(hot_ids))
-        else:
-            idx = int(rng.randint(0, n_docs))
-        doc_id = int(contents[idx]["doc_id"])
-        edges = contents[idx]["edges"]
-        tasks.append(
-            QueryTask(
-                qid=qid,
-                doc_id=doc_id,
-                query=paths[idx],
-                expect_path=paths[idx],
-                chain=(doc_id, int(edges["ref_a"]), int(edges["ref_b"])),
-            )
-        )
-    return tasks
+    # Three bulk draws (hot/cold coin, hot pick, cold pick) rather than per-query RNG calls.
+    coins = rng.rand(n_queries)
+    hot_pick = rng.choice(hot_ids, size=n_queries)
+    cold_pick = rng.randint(0, n_docs, size=n_queries)
+    idx = np.where(coins < repeat_pct, hot_pick, cold_pick)
+
+    rows = zip(idx.tolist(), docs.doc_id[idx].tolist(), docs.ref_a[idx].tolist(), docs.ref_b[idx].tolist())
+    return [
+        QueryTask(qid=qid, doc_id=doc_id, query=paths[i], expect_path=paths[i], chain=(doc_id, ref_a, ref_b), expect_idx=i)
+        for qid, (i, doc_id, ref_a, ref_b) in enumerate(rows)
+    ]
 
 
 def _try_import_dhm():
@@ -225,26 +688,51 @@ def _encode_to_u16_padded(text: str, max_len: int) -> np.ndarray:
     """
     Encode text into uint16 array with padding to max_len.
     """
-    out = np.zeros((max_len,), dtype=np.uint16)
-    # Python loop is acceptable for moderate N; for very large N, generate directly in the GPU harness.
-    n = min(len(text), max_len)
-    for i in range(n):
-        out[i] = np.uint16(ord(text[i]) & 0xFFFF)
-    return out
+    return _encode_paths_u16([text], max_len)[0]
+
+
+# Paths encoded per codec call in `_encode_paths_u16` (bounds the temporary UTF-32 buffer to ~64 MB at L=128).
+_ENCODE_CHUNK = 1 << 17
 
 
 def _encode_paths_u16(paths: List[str], max_len: int) -> np.ndarray:
     """
-    Encode many paths into a contiguous (N, L) uint16 array.
+    Encode many paths into a contiguous (N, L) uint16 array (code point & 0xFFFF, zero padded).
+
+    Each chunk of paths is padded/truncated to L chars, joined, and run through the C UTF-32 codec
+    once; numpy then narrows the code points. No per-char Python work.
     """
     n = len(paths)
     L = int(max_len)
     mat = np.zeros((n, L), dtype=np.uint16)
-    for i, p in enumerate(paths):
-        n_chars = min(len(p), L)
-        for j in range(n_chars):
-            mat[i, j] = np.uint16(ord(p[j]) & 0xFFFF)
-    return np.ascontiguousarray(mat)
+    if L <= 0:
+        return mat
+    for lo in range(0, n, _ENCODE_CHUNK):
+        chunk = paths[lo : lo + _ENCODE_CHUNK]
+        raw = "".join(p[:L].ljust(L, "\0") for p in chunk).encode("utf-32-le")
+        np.bitwise_and(np.frombuffer(raw, dtype="<u4").reshape(len(chunk), L), 0xFFFF, out=mat[lo : lo + len(chunk)], casting="unsafe")
+    return mat
+
+
+def _accuracy(tasks: List[QueryTask], docs: DocTable, idx: np.ndarray) -> Dict[str, Any]:
+    """
+    Score returned row indices (-1 = no answer) against the tasks: top-1 is the expected row (an int
+    compare, no path strings), chain is both of its cross references. One vectorized pass over the
+    DocTable columns.
+    """
+    n = len(tasks)
+    hit = idx >= 0
+    i = np.where(hit, idx, 0)
+    expect_idx = np.fromiter((t.expect_idx for t in tasks), dtype=np.int64, count=n)
+    chain = np.array([t.chain for t in tasks], dtype=np.int64).reshape(n, 3)
+    top1_correct = int(np.count_nonzero(idx == expect_idx))
+    chain_correct = int(np.count_nonzero(hit & (docs.ref_a[i] == chain[:, 1]) & (docs.ref_b[i] == chain[:, 2])))
+    return {
+        "top1_correct": top1_correct,
+        "top1_accuracy": float(top1_correct / n) if n else 0.0,
+        "chain_correct": chain_correct,
+        "chain_accuracy": float(chain_correct / n) if n else 0.0,
+    }
 
 
 def _measure_method(
@@ -252,43 +740,27 @@ def _measure_method(
     name: str,
     tasks: List[QueryTask],
     get_top1_fn,
+    docs: DocTable,
     memoize: bool,
+    cache_size: Optional[int] = None,
 ) -> Dict[str, Any]:
-    lat_ms: List[float] = []
-    top1_correct = 0
-    chain_correct = 0
-    cache: Dict[str, Tuple[str, Any, float]] = {}
-    cache_hits = 0
-    cache_misses = 0
+    """
+    Time `get_top1_fn(query) -> row index` (-1 = no answer) per task; accuracy is scored after the
+    timed loop from the returned indices. With memoize, calls go through an LRU of `cache_size`
+    entries (None = unbounded).
+    """
+    # Integer ns straight into a preallocated array: no float boxing or list growth per task.
+    lat_ns = np.empty(len(tasks), dtype=np.int64)
+    res_idx = np.empty(len(tasks), dtype=np.int64)
+    perf_ns = time.perf_counter_ns
+    top1 = functools.lru_cache(maxsize=cache_size)(get_top1_fn) if memoize else get_top1_fn
 
     t0 = time.perf_counter()
-    for t in tasks:
-        start = time.perf_counter()
-        if memoize:
-            cached = cache.get(t.query)
-            if cached is not None:
-                res = cached
-                cache_hits += 1
-            else:
-                res = get_top1_fn(t.query)
-                cache[t.query] = res
-                cache_misses += 1
-        else:
-            res = get_top1_fn(t.query)
-
-        elapsed_ms = (time.perf_counter() - start) * 1000.0
-        lat_ms.append(float(elapsed_ms))
-
-        path = res[0] if res else None
-        if path == t.expect_path:
-            top1_correct += 1
-
-        # "Context mapping" proxy: verify the doc's two references are consistent with the dataset
-        # (This is still structured retrieval; it's not a semantics/LLM benchmark.)
-        if res and isinstance(res[1], dict) and "edges" in res[1]:
-            edges = res[1]["edges"]
-            if (t.chain[1] == int(edges["ref_a"])) and (t.chain[2] == int(edges["ref_b"])):
-                chain_correct += 1
+    for i, t in enumerate(tasks):
+        start = perf_ns()
+        res = top1(t.query)
+        lat_ns[i] = perf_ns() - start
+        res_idx[i] = res
 
     duration_s = time.perf_counter() - t0
     n = len(tasks)
@@ -299,29 +771,106 @@ def _measure_method(
         "n_queries": n,
         "duration_s": float(duration_s),
         "qps": float(qps),
-        "latency_ms": _latency_stats_ms(lat_ms),
-        "accuracy": {
-            "top1_correct": int(top1_correct),
-            "top1_accuracy": float(top1_correct / n) if n else 0.0,
-            "chain_correct": int(chain_correct),
-            "chain_accuracy": float(chain_correct / n) if n else 0.0,
-        },
+        "latency_ms": _latency_stats_ms(lat_ns * 1e-6),
+        # "Context mapping" proxy: the returned doc's two references must match the dataset's
+        # (this is still structured retrieval; it's not a semantics/LLM benchmark).
+        "accuracy": _accuracy(tasks, docs, res_idx),
+        "memoization": _cache_stats(top1.cache_info() if memoize else None),
+    }
+
+
+def _cache_stats(info: Any) -> Dict[str, Any]:
+    if info is None:
+        return {"enabled": False, "cache_hits": 0, "cache_misses": 0, "cache_size": 0, "cache_maxsize": None, "cache_hit_rate": 0.0}
+    return {
+        "enabled": True,
+        "cache_hits": int(info.hits),
+        "cache_misses": int(info.misses),
+        "cache_size": int(info.currsize),
+        "cache_maxsize": info.maxsize,
+        "cache_hit_rate": float(info.hits / max(1, info.hits + info.misses)),
+    }
+
+
+def _measure_method_batched(
+    *,
+    name: str,
+    tasks: List[QueryTask],
+    batch_top1_fn,
+    docs: DocTable,
+    memoize: bool,
+) -> Dict[str, Any]:
+    """
+    One `batch_top1_fn(queries) -> (Q,) best indices` call for the whole task list, timed as a unit;
+    latency is the amortized per-query cost. With memoize, only the distinct queries are sent and
+    the answers are scattered back to every task.
+    """
+    n = len(tasks)
+    t0 = time.perf_counter()
+    queries = [t.query for t in tasks]
+    if memoize:
+        slot: Dict[str, int] = {}
+        inverse = np.fromiter((slot.setdefault(q, len(slot)) for q in queries), dtype=np.int64, count=n)
+        idx = np.asarray(batch_top1_fn(list(slot)), dtype=np.int64)[inverse]
+    else:
+        idx = np.asarray(batch_top1_fn(queries), dtype=np.int64)
+    duration_s = time.perf_counter() - t0
+
+    return {
+        "name": name,
+        "n_queries": n,
+        "duration_s": float(duration_s),
+        "qps_batched": float(n / duration_s) if duration_s > 0 else 0.0,
+        "latency_ms_amortized": float(duration_s * 1e3 / n) if n else 0.0,
+        "accuracy": _accuracy(tasks, docs, idx),
         "memoization": {
             "enabled": bool(memoize),
-            "cache_hits": int(cache_hits),
-            "cache_misses": int(cache_misses),
-            "cache_size": int(len(cache)),
-            "cache_hit_rate": float(cache_hits / max(1, (cache_hits + cache_misses))) if memoize else 0.0,
+            "n_unique_queries": int(len(slot)) if memoize else n,
         },
     }
 
 
+_RECEIPT_AGG_COLUMNS = ("power_w", "gpu_util_pct", "temp_c", "mem_used_mb")
+
+
+def _receipt_aggregates(sampler: Any) -> Dict[str, Optional[float]]:
+    """
+    <col>_avg / <col>_max over the samples, ignoring missing readings (None when a column has none).
+
+    Reads the sampler's float64 columns (NaN = missing) when it has them; otherwise builds one
+    (N, 4) array from the sample list in a single pass. Either way the reductions are numpy.
+    """
+    names = _RECEIPT_AGG_COLUMNS
+    if hasattr(sampler, "columns"):
+        cols = sampler.columns(names)
+        mat = np.vstack([cols[name] for name in names]).T
+    else:
+        nan = float("nan")
+        mat = np.array(
+            [[nan if (v := getattr(s, name)) is None else v for name in names] for s in sampler.samples],
+            dtype=np.float64,
+        ).reshape(-1, len(names))
+    present = ~np.isnan(mat)
+    has = present.any(axis=0)
+    count = present.sum(axis=0)
+    total = np.where(present, mat, 0.0).sum(axis=0)
+    peak = np.where(present, mat, -np.inf).max(axis=0, initial=-np.inf)
+    out: Dict[str, Optional[float]] = {}
+    for j, name in enumerate(names):
+        out[f"{name}_avg"] = float(total[j] / count[j]) if has[j] else None
+        out[f"{name}_max"] = float(peak[j]) if has[j] else None
+    return out
+
+
 def _maybe_energy_receipt(
     *,
     out_dir: Path,
     gpu_id: int,
     sample_interval_s: float,
     workload_fn,
+    isolate_process: bool = False,
+    pin_cpu: Optional[int] = None,
+    realtime_priority: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Best-effort receipts:
@@ -337,7 +886,15 @@ def _maybe_energy_receipt(
         except Exception as e:
             return {"backend": "unavailable", "error": f"import_failed: {e}"}
 
-    sampler = EnergySampler(gpu_id=gpu_id, sample_interval_s=sample_interval_s)
+    # Only pass opt-in knobs when set, so the internal-module fallback keeps working without them.
+    sampler_kwargs: Dict[str, Any] = {}
+    if isolate_process:
+        sampler_kwargs["isolate_process"] = True
+    if pin_cpu is not None:
+        sampler_kwargs["pin_cpu"] = int(pin_cpu)
+    if realtime_priority is not None:
+        sampler_kwargs["realtime_priority"] = int(realtime_priority)
+    sampler = EnergySampler(gpu_id=gpu_id, sample_interval_s=sample_interval_s, **sampler_kwargs)
     sampler.start()
     t0 = time.perf_counter()
     try:
@@ -346,29 +903,42 @@ def _maybe_energy_receipt(
         duration_s = time.perf_counter() - t0
         sampler.stop()
 
-    energy_j = integrate_energy_j(sampler.samples, duration_s=float(duration_s))
+    if sampler.metadata.get("stop_timeout"):
+        # The sampling thread outlived stop() and is still appending: reading its arrays now would race with
+        # it (and _reserve may swap them). Report the timeout instead of a possibly torn receipt.
+        receipt = {
+            "backend": sampler.backend,
+            "duration_s": float(duration_s),
+            "samples": None,
+            "energy_j": None,
+            "error": "sampler_stop_timeout",
+            "metadata": dict(sampler.metadata),  # one C-level copy: consistent even while the thread writes
+        }
+        _write_json(out_dir / "receipt_energy.json", receipt)
+        return receipt
+
+    # The local sampler is passed whole (its numpy columns); the internal-module fallback's helpers take
+    # the list of samples.
+    samples = sampler if hasattr(sampler, "columns") else sampler.samples
+    energy_j = integrate_energy_j(samples, duration_s=float(duration_s))
     # Simple aggregates (avoid huge dumps)
-    p = [s.power_w for s in sampler.samples if s.power_w is not None]
-    gpu_u = [s.gpu_util_pct for s in sampler.samples if s.gpu_util_pct is not None]
-    temp = [s.temp_c for s in sampler.samples if s.temp_c is not None]
-    mem_used = [s.mem_used_mb for s in sampler.samples if s.mem_used_mb is not None]
-
     receipt = {
         "backend": sampler.backend,
         "duration_s": float(duration_s),
-        "samples": int(len(sampler.samples)),
+        "samples": int(len(samples)),
         "energy_j": float(energy_j) if energy_j is not None else None,
-        "power_w_avg": float(np.mean(p)) if p else None,
-        "power_w_max": float(np.max(p)) if p else None,
-        "gpu_util_pct_avg": float(np.mean(gpu_u)) if gpu_u else None,
-        "gpu_util_pct_max": float(np.max(gpu_u)) if gpu_u else None,
-        "temp_c_avg": float(np.mean(temp)) if temp else None,
-        "temp_c_max": float(np.max(temp)) if temp else None,
-        "mem_used_mb_avg": float(np.mean(mem_used)) if mem_used else None,
-        "mem_used_mb_max": float(np.max(mem_used)) if mem_used else None,
+        **_receipt_aggregates(sampler),
         "metadata": sampler.metadata,
-        "timeseries": samples_to_timeseries(sampler.samples, max_points=1200),
+        "timeseries": samples_to_timeseries(samples, max_points=1200),
     }
+    # Every stored sample goes to CSV, written from the numpy columns; the JSON keeps the downsampled view.
+    # Past the sampler's max_samples cap the stored samples are themselves thinned (metadata
+    # "stored_every_nth_sample"); energy_j is then exact only at stored samples, interpolated between them.
+    if len(samples) and hasattr(sampler, "write_csv"):
+        try:
+            sampler.write_csv(out_dir / "receipt_energy_samples.csv")
+        except OSError:
+            pass
     _write_json(out_dir / "receipt_energy.json", receipt)
     return receipt
 
@@ -387,6 +957,23 @@ def main() -> int:
     ap.add_argument("--emit-nvidia-smi", action="store_true", help="Write nvidia-smi before/after snapshots (best effort)")
     ap.add_argument("--gpu-id", type=int, default=0, help="GPU id for receipts (if enabled)")
     ap.add_argument("--sample-interval-s", type=float, default=0.1, help="Energy sample interval")
+    ap.add_argument(
+        "--sampler-process",
+        action="store_true",
+        help="Run the energy sampler in a child process (shared-memory ring) instead of a thread.",
+    )
+    ap.add_argument("--sampler-cpu", type=int, default=None, help="Pin the energy sampler to this CPU (opt-in)")
+    ap.add_argument(
+        "--sampler-rt-priority",
+        type=int,
+        default=None,
+        help="Run the energy sampler under SCHED_FIFO at this priority 1..99 (opt-in; needs CAP_SYS_NICE)",
+    )
+    ap.add_argument(
+        "--baseline-pure-scan",
+        action="store_true",
+        help="Disable the baseline's exact-key hash fast path (every query does the full LCP scan).",
+    )
     ap.add_argument(
         "--force-dhm-cpu",
         action="store_true",
@@ -430,11 +1017,11 @@ def main() -> int:
 
     # Build dataset (in-memory index is unavoidable for retrieval; the key benefit here is 'no download')
     t_build0 = time.perf_counter()
-    paths, contents = _build_dataset(seed=args.seed, n_docs=args.n_docs, depth=args.depth, fanout=args.fanout)
+    paths, docs = _build_dataset(seed=args.seed, n_docs=args.n_docs, depth=args.depth, fanout=args.fanout)
     build_s = time.perf_counter() - t_build0
 
     # Queries + truth
-    tasks = _build_queries(seed=args.seed, n_queries=args.n_queries, repeat_pct=args.repeat_pct, paths=paths, contents=contents)
+    tasks = _build_queries(seed=args.seed, n_queries=args.n_queries, repeat_pct=args.repeat_pct, paths=paths, docs=docs)
     truth = {
         "n_queries": int(len(tasks)),
         "answers": [
@@ -447,8 +1034,19 @@ def main() -> int:
     # Prepare DHM
     DynamicHierarchyManager = _try_import_dhm()
     dhm = DynamicHierarchyManager(use_gpu=True)
-    for p, c in zip(paths, contents):
-        dhm.insert(concept=p, content=c, path=p)
+    t_dhm0 = time.perf_counter()
+    dhm_contents = docs.contents()
+    if hasattr(dhm, "insert_batch"):
+        # One call for the whole corpus (like dpx_lcp_index_load on the ctdr path).
+        dhm.insert_batch(paths, dhm_contents)
+        dhm_insert = "batch"
+    else:
+        insert = dhm.insert
+        for p, c in zip(paths, dhm_contents):
+            insert(concept=p, content=c, path=p)
+        dhm_insert = "loop"
+    dhm_insert_s = time.perf_counter() - t_dhm0
+    del dhm_contents
 
     dhm_stats = dhm.get_stats()
     gpu_available = bool(dhm_stats.get("gpu_available"))
@@ -457,25 +1055,114 @@ def main() -> int:
     ctdr_available = ctdr is not None and hasattr(ctdr, "dpx_lcp_index_load")
 
     # Exact index (O(1) lookup) — demonstrates "indexed retrieval avoids scan" without any GPU.
-    exact_index = {p: c for p, c in zip(paths, contents)}
+    exact_index = {p: i for i, p in enumerate(paths)}
+
+    # Baseline top1: still a full scan of every candidate, but over a pre-encoded (N, L) matrix of
+    # one-byte char codes (see _u8_char_codes: the scan is memory-bound, so bytes per row decide its
+    # speed). Only a corpus with more than 254 distinct chars stays uint16, on the numpy kernel.
+    max_len = int(args.max_path_len)
+    row_width = _lcp_row_width(max_len)
+    paths_mat = _encode_paths_u16(paths, max_len=row_width)
+    char_lut = _u8_char_codes(paths_mat)
+    if char_lut is not None:
+        paths_mat = char_lut[paths_mat]
+
+    def encode_rows(keys: List[str]) -> np.ndarray:
+        rows = _encode_paths_u16(keys, max_len=row_width)
+        return char_lut[rows] if char_lut is not None else rows
+
+    paths_u64 = paths_mat.view(np.uint64)
+    path_lens = np.minimum(np.fromiter(map(len, paths), dtype=np.int64, count=len(paths)), max_len)
+    baseline_kernel = "numpy"
+    lcp_scan = None
+
+    def lcp_scan_batch(q_mat: np.ndarray, q_lens: np.ndarray) -> np.ndarray:
+        return _lcp_top1_batch_vectorized(q_mat, q_lens, paths_mat, path_lens)
+
+    # --max-path-len is fixed for the run: prefer a kernel compiled for this exact row width.
+    lcp_ext = (_load_lcp_ext(row_width) or _load_lcp_ext()) if paths and char_lut is not None else None
+    if lcp_ext is not None:
+        lcp_ext_fn, lcp_ext_batch_fn, baseline_kernel = lcp_ext
+        ext_out = ctypes.c_int64()
+        ext_args = (paths_mat.ctypes.data, paths_mat.shape[0], row_width, path_lens.ctypes.data)
+
+        def lcp_scan(q_row: np.ndarray, q_len: int) -> Tuple[int, int]:
+            idx = lcp_ext_fn(*ext_args, q_row.ctypes.data, q_len, ctypes.byref(ext_out))
+            return int(idx), int(ext_out.value)
+
+        def lcp_scan_batch(q_mat: np.ndarray, q_lens: np.ndarray) -> np.ndarray:
+            out = np.empty(q_mat.shape[0], dtype=np.int64)
+            lcp_ext_batch_fn(*ext_args, q_mat.ctypes.data, q_lens.ctypes.data, q_mat.shape[0], out.ctypes.data)
+            return out
+
+    elif _lcp_top1_nb is not None and paths and char_lut is not None:
+        try:
+            # Compile (or load from cache) outside the timed loop.
+            q0 = encode_rows(paths[:1])
+            _lcp_top1_nb(paths_u64, path_lens, q0[0].view(np.uint64), 0)
+            _lcp_top1_batch_nb(paths_u64, path_lens, q0.view(np.uint64), np.zeros(1, dtype=np.int64))
 
-    # Baseline top1
-    def baseline_top1(q: str):
-        idx, _lcp = _naive_lcp_top1(q, paths, max_len=int(args.max_path_len))
-        return (paths[idx], contents[idx], 0.0)
+            def lcp_scan(q_row: np.ndarray, q_len: int) -> Tuple[int, int]:
+                idx, lcp = _lcp_top1_nb(paths_u64, path_lens, q_row.view(np.uint64), q_len)
+                return int(idx), int(lcp)
+
+            def lcp_scan_batch(q_mat: np.ndarray, q_lens: np.ndarray) -> np.ndarray:
+                return _lcp_top1_batch_nb(paths_u64, path_lens, q_mat.view(np.uint64), q_lens)
+
+            baseline_kernel = "numba"
+        except Exception:
+            lcp_scan = None
 
-    def exact_index_top1(q: str):
-        c = exact_index.get(q)
-        if c is None:
-            return ("", {}, 0.0)
-        return (q, c, 1.0)
+    # Exact-key fast path: a query equal to a known path resolves by hash to the scan's own answer.
+    exact_top1 = {} if args.baseline_pure_scan else _exact_lcp_top1_index(paths, max_len=max_len)
 
-    # DHM top1 (use fast top1 when possible)
-    def dhm_top1(q: str):
+    def baseline_top1(q: str):
+        i = exact_top1.get(q[:max_len])
+        if i is not None:
+            return i
+        q_row = encode_rows([q[:max_len]])[0]
+        if lcp_scan is not None:
+            idx, _lcp = lcp_scan(q_row, min(len(q), max_len))
+        else:
+            idx, _lcp = _lcp_top1_vectorized(q_row, min(len(q), max_len), paths_mat, path_lens)
+        return idx
+
+    def baseline_top1_batch(queries: List[str]) -> np.ndarray:
+        # Exact keys by hash as in baseline_top1; the rest go to the kernel as one (Q, width) matrix.
+        keys = [q[:max_len] for q in queries]
+        idx = np.fromiter((exact_top1.get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+        miss = np.flatnonzero(idx < 0)
+        if miss.shape[0]:
+            miss_keys = [keys[i] for i in miss.tolist()]
+            q_lens = np.fromiter(map(len, miss_keys), dtype=np.int64, count=len(miss_keys))
+            idx[miss] = lcp_scan_batch(encode_rows(miss_keys), q_lens)
+        return idx
+
+    # Radix trie over the same paths: an exact structured alternative to the scan (same answers).
+    t_trie0 = time.perf_counter()
+    trie_root = _build_prefix_trie(paths, max_len=max_len)
+    trie_build_s = time.perf_counter() - t_trie0
+
+    def trie_top1(q: str) -> int:
+        return _trie_lcp_top1(trie_root, q, max_len=max_len)
+
+    # Sorted paths + neighbour LCP + RMQ: binary search instead of a scan (same answers).
+    t_sa0 = time.perf_counter()
+    sa_index = _SortedLcpIndex(paths, paths_mat, path_lens, max_len=max_len) if paths else None
+    sa_build_s = time.perf_counter() - t_sa0
+
+    def sa_top1(q: str) -> int:
+        return sa_index.top1(q) if sa_index is not None else 0
+
+    def exact_index_top1(q: str) -> int:
+        return exact_index.get(q, -1)
+
+    # DHM top1 (use fast top1 when possible); its (path, content, score) answer maps back to a row.
+    def dhm_top1(q: str) -> int:
         r = dhm.search_top1(q)
         if r is None:
-            return ("", {}, 0.0)
-        return r
+            return -1
+        return exact_index.get(r[0], -1)
 
     # Direct DPX path (ctdr_python) — this is the "GPU story" when available.
     ctdr_candidates_u16: Optional[np.ndarray] = None
@@ -485,63 +1172,128 @@ def main() -> int:
         nonlocal ctdr_candidates_u16, ctdr_loaded
         if not ctdr_available or ctdr_loaded:
             return
-        ctdr_candidates_u16 = _encode_paths_u16(paths, max_len=int(args.max_path_len))
+        # DPX takes uint16 chars, not the baseline's one-byte codes.
+        ctdr_candidates_u16 = _encode_paths_u16(paths, max_len=max_len)
         ok = bool(ctdr.dpx_lcp_index_load(ctdr_candidates_u16.tobytes(order="C"), int(ctdr_candidates_u16.shape[0])))
         if not ok:
             raise RuntimeError("ctdr_python.dpx_lcp_index_load returned false")
         # Warmup (one query)
-        q0 = _encode_to_u16_padded(tasks[0].query, max_len=int(args.max_path_len))
+        q0 = _encode_to_u16_padded(tasks[0].query, max_len=max_len)
         ok2 = bool(ctdr.dpx_lcp_index_set_query(q0.tobytes(order="C")))
         if not ok2:
             raise RuntimeError("ctdr_python.dpx_lcp_index_set_query returned false")
         _ = ctdr.dpx_lcp_index_query_top1()
         ctdr_loaded = True
 
+    # Every distinct query string encoded once, in one vectorized pass, so the timed ctdr loop only ships bytes.
+    ctdr_query_bytes: Dict[str, bytes] = {}
+    if ctdr_available:
+        unique_queries = list(dict.fromkeys(t.query for t in tasks))
+        unique_u16 = _encode_paths_u16(unique_queries, max_len=max_len)
+        ctdr_query_bytes = {q: row.tobytes(order="C") for q, row in zip(unique_queries, unique_u16)}
+
     def ctdr_top1(q: str):
         _ctdr_load_once()
-        q_u16 = _encode_to_u16_padded(q, max_len=int(args.max_path_len))
-        ok2 = bool(ctdr.dpx_lcp_index_set_query(q_u16.tobytes(order="C")))
+        q_bytes = ctdr_query_bytes.get(q)
+        if q_bytes is None:
+            q_bytes = _encode_to_u16_padded(q, max_len=max_len).tobytes(order="C")
+        ok2 = bool(ctdr.dpx_lcp_index_set_query(q_bytes))
         if not ok2:
             raise RuntimeError("ctdr_python.dpx_lcp_index_set_query returned false")
         best_idx, _best_lcp = ctdr.dpx_lcp_index_query_top1()
-        idx = int(best_idx)
-        return (paths[idx], contents[idx], 1.0 if paths[idx] == q else 0.0)
+        return int(best_idx)
+
+    # Batched DPX entry point, only in bindings that export it: all queries in one call.
+    ctdr_batch_fn = getattr(ctdr, "dpx_lcp_index_query_top1_batch", None) if ctdr_available else None
+
+    def ctdr_top1_batch(queries: List[str]) -> np.ndarray:
+        _ctdr_load_once()
+        q_mat = _encode_paths_u16(queries, max_len=max_len)
+        res = ctdr_batch_fn(q_mat.tobytes(order="C"), int(q_mat.shape[0]))
+        # (Q,) indices or (Q, 2) [index, lcp] pairs, depending on the binding.
+        return np.asarray(res, dtype=np.int64).reshape(len(queries), -1)[:, 0]
 
     results: Dict[str, Any] = {
-        "build": {"dataset_build_s": float(build_s), "dhm_stats": dhm_stats},
+        "build": {
+            "dataset_build_s": float(build_s),
+            "dhm_stats": dhm_stats,
+            "dhm_insert": dhm_insert,
+            "dhm_insert_s": float(dhm_insert_s),
+            "baseline_kernel": baseline_kernel,
+            "baseline_encoding": "u8_codes" if char_lut is not None else "u16",
+            "baseline_exact_fast_path": not args.baseline_pure_scan,
+            "trie_build_s": float(trie_build_s),
+            "sa_build_s": float(sa_build_s),
+        },
         "methods": {},
     }
 
     # Measure without memoization
-    results["methods"]["baseline_no_memo"] = _measure_method(name="baseline_naive_lcp_scan", tasks=tasks, get_top1_fn=baseline_top1, memoize=False)
-    results["methods"]["indexed_no_memo"] = _measure_method(name="indexed_exact_lookup", tasks=tasks, get_top1_fn=exact_index_top1, memoize=False)
+    results["methods"]["baseline_no_memo"] = _measure_method(name="baseline_naive_lcp_scan", tasks=tasks, get_top1_fn=baseline_top1, docs=docs, memoize=False)
+    results["methods"]["trie_no_memo"] = _measure_method(name="radix_trie_lcp_top1", tasks=tasks, get_top1_fn=trie_top1, docs=docs, memoize=False)
+    results["methods"]["sa_no_memo"] = _measure_method(name="sa_lcp_top1", tasks=tasks, get_top1_fn=sa_top1, docs=docs, memoize=False)
+    results["methods"]["indexed_no_memo"] = _measure_method(name="indexed_exact_lookup", tasks=tasks, get_top1_fn=exact_index_top1, docs=docs, memoize=False)
     if gpu_available or args.force_dhm_cpu:
-        results["methods"]["dhm_no_memo"] = _measure_method(name="dhm_baire_top1", tasks=tasks, get_top1_fn=dhm_top1, memoize=False)
+        results["methods"]["dhm_no_memo"] = _measure_method(name="dhm_baire_top1", tasks=tasks, get_top1_fn=dhm_top1, docs=docs, memoize=False)
     else:
         results["methods"]["dhm_no_memo"] = {"name": "dhm_baire_top1", "skipped": True, "reason": "gpu_not_available (use --force-dhm-cpu to measure CPU fallback)"}
     if ctdr_available:
         try:
-            results["methods"]["ctdr_dpx_no_memo"] = _measure_method(name="ctdr_dpx_lcp_top1", tasks=tasks, get_top1_fn=ctdr_top1, memoize=False)
+            results["methods"]["ctdr_dpx_no_memo"] = _measure_method(name="ctdr_dpx_lcp_top1", tasks=tasks, get_top1_fn=ctdr_top1, docs=docs, memoize=False)
         except Exception as e:
             results["methods"]["ctdr_dpx_no_memo"] = {"name": "ctdr_dpx_lcp_top1", "error": str(e)}
     else:
         results["methods"]["ctdr_dpx_no_memo"] = {"name": "ctdr_dpx_lcp_top1", "skipped": True, "reason": "ctdr_python_not_available (set CTDR_PYTHON_PATH on H100 Linux box)"}
 
-    # Measure with memoization (application-level cache)
-    results["methods"]["baseline_memo"] = _measure_method(name="baseline_naive_lcp_scan", tasks=tasks, get_top1_fn=baseline_top1, memoize=True)
-    results["methods"]["indexed_memo"] = _measure_method(name="indexed_exact_lookup", tasks=tasks, get_top1_fn=exact_index_top1, memoize=True)
+    # Measure with memoization (application-level LRU, a few times the hot set so churn from cold
+    # queries does not evict it)
+    memo_cache_size = max(1024, 4 * _hot_set_size(len(paths), args.repeat_pct))
+    results["methods"]["baseline_memo"] = _measure_method(name="baseline_naive_lcp_scan", tasks=tasks, get_top1_fn=baseline_top1, docs=docs, memoize=True, cache_size=memo_cache_size)
+    results["methods"]["trie_memo"] = _measure_method(name="radix_trie_lcp_top1", tasks=tasks, get_top1_fn=trie_top1, docs=docs, memoize=True, cache_size=memo_cache_size)
+    results["methods"]["sa_memo"] = _measure_method(name="sa_lcp_top1", tasks=tasks, get_top1_fn=sa_top1, docs=docs, memoize=True, cache_size=memo_cache_size)
+    results["methods"]["indexed_memo"] = _measure_method(name="indexed_exact_lookup", tasks=tasks, get_top1_fn=exact_index_top1, docs=docs, memoize=True, cache_size=memo_cache_size)
     if gpu_available or args.force_dhm_cpu:
-        results["methods"]["dhm_memo"] = _measure_method(name="dhm_baire_top1", tasks=tasks, get_top1_fn=dhm_top1, memoize=True)
+        results["methods"]["dhm_memo"] = _measure_method(name="dhm_baire_top1", tasks=tasks, get_top1_fn=dhm_top1, docs=docs, memoize=True, cache_size=memo_cache_size)
     else:
         results["methods"]["dhm_memo"] = {"name": "dhm_baire_top1", "skipped": True, "reason": "gpu_not_available (use --force-dhm-cpu to measure CPU fallback)"}
     if ctdr_available:
         try:
-            results["methods"]["ctdr_dpx_memo"] = _measure_method(name="ctdr_dpx_lcp_top1", tasks=tasks, get_top1_fn=ctdr_top1, memoize=True)
+            results["methods"]["ctdr_dpx_memo"] = _measure_method(name="ctdr_dpx_lcp_top1", tasks=tasks, get_top1_fn=ctdr_top1, docs=docs, memoize=True, cache_size=memo_cache_size)
         except Exception as e:
             results["methods"]["ctdr_dpx_memo"] = {"name": "ctdr_dpx_lcp_top1", "error": str(e)}
     else:
         results["methods"]["ctdr_dpx_memo"] = {"name": "ctdr_dpx_lcp_top1", "skipped": True, "reason": "ctdr_python_not_available (set CTDR_PYTHON_PATH on H100 Linux box)"}
 
+    # Whole task list in one call per method (amortized dispatch); reported as qps_batched.
+    for memo, suffix in ((False, "no_memo"), (True, "memo")):
+        results["methods"][f"baseline_batched_{suffix}"] = _measure_method_batched(
+            name="baseline_naive_lcp_scan_batched", tasks=tasks, batch_top1_fn=baseline_top1_batch, docs=docs, memoize=memo
+        )
+        if ctdr_batch_fn is not None:
+            try:
+                results["methods"][f"ctdr_dpx_batched_{suffix}"] = _measure_method_batched(
+                    name="ctdr_dpx_lcp_top1_batched", tasks=tasks, batch_top1_fn=ctdr_top1_batch, docs=docs, memoize=memo
+                )
+            except Exception as e:
+                results["methods"][f"ctdr_dpx_batched_{suffix}"] = {"name": "ctdr_dpx_lcp_top1_batched", "error": str(e)}
+        else:
+            results["methods"][f"ctdr_dpx_batched_{suffix}"] = {"name": "ctdr_dpx_lcp_top1_batched", "skipped": True, "reason": "ctdr_python has no dpx_lcp_index_query_top1_batch"}
+
+    # Kernel run once per distinct query up front; the timed loop is then a pure dict lookup, so this row
+    # isolates the caching layer from the DPX kernel measured above.
+    if ctdr_available:
+        try:
+            t_pre0 = time.perf_counter()
+            ctdr_unique_result = {q: ctdr_top1(q) for q in ctdr_query_bytes}
+            ctdr_precompute_s = time.perf_counter() - t_pre0
+            m = _measure_method(name="ctdr_dpx_lcp_top1_precomputed", tasks=tasks, get_top1_fn=ctdr_unique_result.__getitem__, docs=docs, memoize=False)
+            m["precompute"] = {"n_unique_queries": int(len(ctdr_unique_result)), "duration_s": float(ctdr_precompute_s)}
+            results["methods"]["ctdr_dpx_precomputed"] = m
+        except Exception as e:
+            results["methods"]["ctdr_dpx_precomputed"] = {"name": "ctdr_dpx_lcp_top1_precomputed", "error": str(e)}
+    else:
+        results["methods"]["ctdr_dpx_precomputed"] = {"name": "ctdr_dpx_lcp_top1_precomputed", "skipped": True, "reason": "ctdr_python_not_available (set CTDR_PYTHON_PATH on H100 Linux box)"}
+
     # Optional receipts: measure only one representative workload (dhm_no_memo) to keep it short.
     if args.enable_energy_receipts:
         if args.emit_nvidia_smi:
@@ -551,17 +1303,20 @@ def main() -> int:
         def _work():
             # Prefer DHM if GPU is available; otherwise measure the indexed lookup path (still meaningful receipts).
             if ctdr_available:
-                _ = _measure_method(name="ctdr_dpx_lcp_top1", tasks=tasks[: min(5000, len(tasks))], get_top1_fn=ctdr_top1, memoize=False)
+                _ = _measure_method(name="ctdr_dpx_lcp_top1", tasks=tasks[: min(5000, len(tasks))], get_top1_fn=ctdr_top1, docs=docs, memoize=False)
             elif gpu_available:
-                _ = _measure_method(name="dhm_baire_top1", tasks=tasks[: min(5000, len(tasks))], get_top1_fn=dhm_top1, memoize=False)
+                _ = _measure_method(name="dhm_baire_top1", tasks=tasks[: min(5000, len(tasks))], get_top1_fn=dhm_top1, docs=docs, memoize=False)
             else:
-                _ = _measure_method(name="indexed_exact_lookup", tasks=tasks[: min(5000, len(tasks))], get_top1_fn=exact_index_top1, memoize=False)
+                _ = _measure_method(name="indexed_exact_lookup", tasks=tasks[: min(5000, len(tasks))], get_top1_fn=exact_index_top1, docs=docs, memoize=False)
 
         receipt = _maybe_energy_receipt(
             out_dir=out_dir,
             gpu_id=int(args.gpu_id),
             sample_interval_s=float(args.sample_interval_s),
             workload_fn=_work,
+            isolate_process=bool(args.sampler_process),
+            pin_cpu=args.sampler_cpu,
+            realtime_priority=args.sampler_rt_priority,
         )
         results["receipt_energy"] = receipt
 
@@ -575,22 +1330,8 @@ def main() -> int:
 
     _write_json(out_dir / "results.json", results)
 
-    # Receipt hashes (cheap-to-verify)
-    hashes = {
-        "scenario.json": _sha256_hex(out_dir / "scenario.json"),
-        "dataset_spec.json": _sha256_hex(out_dir / "dataset_spec.json"),
-        "environment.json": _sha256_hex(out_dir / "environment.json"),
-        "truth.json": _sha256_hex(out_dir / "truth.json"),
-        "results.json": _sha256_hex(out_dir / "results.json"),
-    }
-    if (out_dir / "receipt_energy.json").exists():
-        hashes["receipt_energy.json"] = _sha256_hex(out_dir / "receipt_energy.json")
-    if (out_dir / "nvidia_smi_before.txt").exists():
-        hashes["nvidia_smi_before.txt"] = _sha256_hex(out_dir / "nvidia_smi_before.txt")
-    if (out_dir / "nvidia_smi_after.txt").exists():
-        hashes["nvidia_smi_after.txt"] = _sha256_hex(out_dir / "nvidia_smi_after.txt")
-    if (out_dir / "nvidia_smi_snapshot.txt").exists():
-        hashes["nvidia_smi_snapshot.txt"] = _sha256_hex(out_dir / "nvidia_smi_snapshot.txt")
+    # Receipt hashes (cheap-to-verify), streamed in a fixed order; optional artifacts only if written.
+    hashes = {name: _sha256_hex(out_dir / name) for name in _HASHED_ARTIFACTS if (out_dir / name).is_file()}
     _write_json(out_dir / "receipt_hashes.json", hashes)
 
     print(f"OK: wrote artifacts to {out_dir}")
@@ -51,7 +51,22 @@ function _setGate(id, status, extra) {
 }
 
 function _safeArr(x) {
-  return Array.isArray(x) ? x : null;
+  if (Array.isArray(x)) return x;
+  // Packed telemetry (build_summary_public.py --telemetry-encoding b64-f32): base64 little-endian float32.
+  if (x && typeof x === "object" && x.encoding === "b64-f32" && typeof x.data === "string") {
+    try {
+      const bin = atob(x.data);
+      if (bin.length !== 4 * x.n) return null;
+      const view = new DataView(new ArrayBuffer(bin.length));
+      for (let i = 0; i < bin.length; i++) view.setUint8(i, bin.charCodeAt(i));
+      const out = new Array(x.n);
+      for (let i = 0; i < x.n; i++) out[i] = view.getFloat32(4 * i, true);
+      return out;
+    } catch (e) {
+      return null;
+    }
+  }
+  return null;
 }
 
 function _normalizeTempC(tempC) {
@@ -220,7 +235,9 @@ function renderSummary(s) {
 
   // Source links
   const src = s.source?.b_compare_json || s.source?.path || "#";
-  const sha = s.source?.b_compare_sha256 || s.source?.sha256 || "UNKNOWN";
+  // The digest is stored under its algorithm's name (source.hash_alg; sha256 unless the pack chose otherwise).
+  const hashAlg = s.source?.b_compare_sha256 ? "sha256" : (s.source?.hash_alg || "sha256");
+  const digest = s.source?.b_compare_sha256 || s.source?.[hashAlg] || "UNKNOWN";
   const srcEl = document.getElementById("src-bcompare");
   if (srcEl) {
     srcEl.textContent = src;
@@ -232,7 +249,7 @@ function renderSummary(s) {
     const isAbs = src.startsWith("http://") || src.startsWith("https://") || src.startsWith("file:");
     a.href = src.startsWith("#") ? "#" : (isAbs ? src : "../" + src);
   });
-  fillText("#src-sha", sha === "UNKNOWN" ? "sha256: —" : ("sha256: " + String(sha).slice(0, 16) + "…"));
+  fillText("#src-sha", digest === "UNKNOWN" ? `${hashAlg}: —` : `${hashAlg}: ${String(digest).slice(0, 16)}…`);
 
   // OOM boundary
   const n80 = s.analytic?.oom_wall?.n_at_h100_80gb;
@@ -6,35 +6,149 @@ Supported inputs:
   - AB compare JSON (B_compare.json) used by the CTDR public teaser.
   - Babel challenge out-dir (results.json + receipt_energy.json optionally).
 
-No external deps.
+No external deps (orjson is used for JSON I/O when installed; stdlib json otherwise).
 """
 
 from __future__ import annotations
 
 import argparse
+import base64
 import hashlib
 import json
+import math
+import mmap
+import sys
+from array import array
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson  # optional: faster parse/encode of large energy timeseries
+except ImportError:  # pragma: no cover
+    orjson = None
 
 
 def _load_json(p: Path) -> Any:
+    if orjson is not None:
+        raw = p.read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # e.g. NaN/Infinity literals, which only the stdlib parser accepts.
+            return json.loads(raw.decode("utf-8"))
     return json.loads(p.read_text(encoding="utf-8"))
 
 
-def _sha256_hex(p: Path) -> str:
-    return hashlib.sha256(p.read_bytes()).hexdigest()
+def _has_non_finite(obj: Any) -> bool:
+    """
+    True if obj holds a NaN/Infinity float. orjson writes those as null, the stdlib as NaN/Infinity
+    literals; callers keep the stdlib output for such objects.
+    """
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(map(_has_non_finite, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        if set(map(type, obj)) <= _NUM_TYPES:
+            # One C-level sum: NaN/Infinity propagate (a finite overflow only costs the stdlib path).
+            try:
+                return not math.isfinite(sum(obj, 0.0))
+            except OverflowError:
+                return True
+        return any(map(_has_non_finite, obj))
+    return False
+
+
+def _write_json(p: Path, obj: Any) -> None:
+    # One encoded copy at most: orjson returns the final bytes; json.dump streams chunks into the file.
+    if orjson is not None and not _has_non_finite(obj):
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; the stdlib encoder handles them
+        else:
+            p.write_bytes(data)
+            return
+    with p.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+HASH_ALGS = ("sha256", "blake2b")
+# Raw NVML series (10 Hz over minutes) are thinned to at most this many points before attaching.
+TIMESERIES_MAX_POINTS = 2000
+# "json": plain number arrays. "b64-f32": {"encoding": "b64-f32", "n": len, "data": base64 of little-endian float32}.
+TELEMETRY_ENCODINGS = ("json", "b64-f32")
+_NUM_TYPES = frozenset((int, float))
+
+
+def _has_sha_extensions() -> bool:
+    """
+    True when the CPU hashes SHA-256 in hardware (x86 SHA-NI "sha_ni", Arm "sha2"), from /proc/cpuinfo.
+    """
+    try:
+        info = Path("/proc/cpuinfo").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return False
+    for line in info.splitlines():
+        key, _, val = line.partition(":")
+        if key.strip() in ("flags", "Features"):
+            flags = val.split()
+            return "sha_ni" in flags or "sha2" in flags
+    return False
+
+
+def _auto_hash_alg() -> str:
+    # Without SHA extensions BLAKE2b is the faster 256-bit digest; with them SHA-256 wins.
+    return "sha256" if _has_sha_extensions() else "blake2b"
+
+
+def _hasher(algo: str) -> Any:
+    if algo == "blake2b":
+        return hashlib.blake2b(digest_size=32)
+    return hashlib.new(algo)
+
+
+def _file_digest(p: Path, algo: str = "sha256") -> str:
+    # Hashed straight from the page cache via mmap (no read copy); streamed reads where mmap is unavailable
+    # (empty files, special files, >2 GiB on 32-bit).
+    with p.open("rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h = _hasher(algo)
+                h.update(mm)
+                return h.hexdigest()
+        except (OSError, ValueError, OverflowError):
+            pass
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, lambda: _hasher(algo)).hexdigest()
+        h = _hasher(algo)
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _path_parts(path: str) -> Tuple[str, ...]:
+    # Summary builders look up the same few dozen literal paths; split each once.
+    return tuple(path.split("."))
 
 
 def _get(d: Dict[str, Any], path: str) -> Any:
     cur: Any = d
-    for part in path.split("."):
+    for part in _path_parts(path):
         if not isinstance(cur, dict) or part not in cur:
             return None
         cur = cur[part]
     return cur
 
 
+def _extract(d: Any, paths: Tuple[str, ...]) -> Dict[str, Any]:
+    # Per-path _get beats a shared-prefix single walk here: paths are <= 3 deep, and a trie walk in
+    # Python costs more in calls than it saves in dict lookups (~3.0 us vs ~3.9 us for 9 fields).
+    return {path: _get(d, path) for path in paths}
+
+
 def _num(x: Any) -> Optional[float]:
     if x is None:
         return None
@@ -50,7 +164,15 @@ def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
-def _maybe_attach_memoization_track(summary: Dict[str, Any]) -> None:
+def _add_disclaimer(summary: Dict[str, Any], msg: str) -> None:
+    # Append once. A linear `in` is right here: a summary carries a handful of disclaimers, and a
+    # set would have to be rebuilt from the list on every call anyway.
+    disc = summary.get("disclaimers")
+    if isinstance(disc, list) and msg not in disc:
+        disc.append(msg)
+
+
+def _maybe_attach_memoization_track(summary: Dict[str, Any], *, hash_alg: str = "sha256") -> None:
     """
     Attach a public-safe "memoization/routing" track if the artifact exists.
 
@@ -73,46 +195,68 @@ def _maybe_attach_memoization_track(summary: Dict[str, Any]) -> None:
     tracks = summary.setdefault("tracks", {})
     tracks["memoization_prefix_range"] = {
         "schema": "sigma_track_memoization_prefix_range_v1",
-        "source": {"type": "artifact_json", "path": str(p.relative_to(_repo_root()).as_posix()), "sha256": _sha256_hex(p)},
+        "source": {
+            "type": "artifact_json",
+            "path": str(p.relative_to(_repo_root()).as_posix()),
+            "hash_alg": hash_alg,
+            hash_alg: _file_digest(p, hash_alg),
+        },
         "data": d,
     }
 
-    # Add a short disclaimer line if not already present.
-    disc = summary.get("disclaimers")
-    if isinstance(disc, list):
-        msg = "Memoization/routing track reports an M<<N work-shrink (range top-1 on bucketed layout). It's a different axis than vector_scan AB."
-        if msg not in disc:
-            disc.append(msg)
-
-
-def build_from_ab_compare(b_compare: Dict[str, Any], *, source_path: str, source_sha: str) -> Dict[str, Any]:
-    c = b_compare.get("ctdr", {})
-    v = b_compare.get("vector", {})
+    _add_disclaimer(
+        summary,
+        "Memoization/routing track reports an M<<N work-shrink (range top-1 on bucketed layout). It's a different axis than vector_scan AB.",
+    )
+
+
+# Per-engine fields read from B_compare.json's "ctdr" / "vector" blocks.
+_AB_ENGINE_FIELDS = (
+    "energy.metadata.name",
+    "energy.metadata.power_limit_w",
+    "qps",
+    "latency_ms.p95",
+    "energy.joules_per_query",
+    "energy.power_w_avg",
+    "energy.gpu_util_pct_avg",
+    "energy.temp_c_avg",
+    "accuracy.top1_accuracy",
+)
+
+
+def build_from_ab_compare(
+    b_compare: Dict[str, Any], *, source_path: str, source_sha: str, hash_alg: str = "sha256"
+) -> Dict[str, Any]:
+    """
+    source_sha is the source file's digest under hash_alg; it is stored under that name in `source`.
+    """
+    c = _extract(b_compare.get("ctdr", {}), _AB_ENGINE_FIELDS)
+    v = _extract(b_compare.get("vector", {}), _AB_ENGINE_FIELDS)
 
     summary: Dict[str, Any] = {
         "schema": "sigma_summary_public_v1",
         "gpu": {
-            "name": _get(c, "energy.metadata.name") or _get(v, "energy.metadata.name") or "UNKNOWN",
-            "power_limit_w": _num(_get(c, "energy.metadata.power_limit_w") or _get(v, "energy.metadata.power_limit_w")),
+            "name": c["energy.metadata.name"] or v["energy.metadata.name"] or "UNKNOWN",
+            "power_limit_w": _num(c["energy.metadata.power_limit_w"] or v["energy.metadata.power_limit_w"]),
         },
         "metrics": {
             "omega": {
-                "qps": _num(_get(c, "qps")),
-                "lat_p95_ms": _num(_get(c, "latency_ms.p95")),
-                "joules_per_query": _num(_get(c, "energy.joules_per_query")),
-                "power_w_avg": _num(_get(c, "energy.power_w_avg")),
-                "gpu_util_pct_avg": _num(_get(c, "energy.gpu_util_pct_avg")),
-                "temp_c_avg": _num(_get(c, "energy.temp_c_avg")),
-                "top1_accuracy": _num(_get(c, "accuracy.top1_accuracy")),
+                "qps": _num(c["qps"]),
+                "lat_p95_ms": _num(c["latency_ms.p95"]),
+                "joules_per_query": _num(c["energy.joules_per_query"]),
+                "power_w_avg": _num(c["energy.power_w_avg"]),
+                "gpu_util_pct_avg": _num(c["energy.gpu_util_pct_avg"]),
+                "temp_c_avg": _num(c["energy.temp_c_avg"]),
+                "top1_accuracy": _num(c["accuracy.top1_accuracy"]),
             },
             "baseline": {
-                "qps": _num(_get(v, "qps")),
-                "lat_p95_ms": _num(_get(v, "latency_ms.p95")),
-                "joules_per_query": _num(_get(v, "energy.joules_per_query")),
-                "power_w_avg": _num(_get(v, "energy.power_w_avg")),
-                "gpu_util_pct_avg": _num(_get(v, "energy.gpu_util_pct_avg")),
-                "temp_c_avg": _num(_get(v, "energy.temp_c_avg")),
-                "top1_accuracy": _num(_get(v, "accuracy.top1_accuracy")),
+                "qps": _num(v["qps"]),
+                "lat_p95_ms": _num(v["latency_ms.p95"]),
+                "joules_per_query": _num(v["energy.joules_per_query"]),
+                "power_w_avg": _num(v["energy.power_w_avg"]),
+                "gpu_util_pct_avg": _num(v["energy.gpu_util_pct_avg"]),
+                "temp_c_avg": _num(v["energy.temp_c_avg"]),
+                "top1_accuracy": _num(v["accuracy.top1_accuracy"]),
             },
             "feasibility": {
                 # fp16 NxN bytes = N^2*2 => 80GB boundary at ~200k
@@ -122,7 +266,8 @@ def build_from_ab_compare(b_compare: Dict[str, Any], *, source_path: str, source
         "source": {
             "type": "ab_compare",
             "path": source_path,
-            "sha256": source_sha,
+            "hash_alg": hash_alg,
+            hash_alg: source_sha,
             "baseline_note": _get(b_compare, "notes.baseline"),
             "truth_mode": _get(b_compare, "notes.truth_mode"),
         },
@@ -133,7 +278,7 @@ def build_from_ab_compare(b_compare: Dict[str, Any], *, source_path: str, source
         ],
     }
 
-    _maybe_attach_memoization_track(summary)
+    _maybe_attach_memoization_track(summary, hash_alg=hash_alg)
     return summary
 
 
@@ -149,13 +294,61 @@ def _maybe_attach_energy_timeseries(summary: Dict[str, Any], *, block: str, ener
     ts = energy_obj.get("timeseries")
     if not isinstance(ts, dict):
         return
-    if not isinstance(ts.get("t_s"), list) or not isinstance(ts.get("power_w"), list):
+    t, pw = ts.get("t_s"), ts.get("power_w")
+    # validate_summary_public.py's gate (number arrays of equal length), plus finite values: NaN/Infinity
+    # are not JSON numbers (orjson writes null, which the validator rejects; the dashboard's JSON.parse
+    # rejects the stdlib's literals). A malformed series is skipped here instead of producing a summary
+    # that fails downstream. The type scan and the sums (NaN/Infinity propagate) run in C.
+    if not isinstance(t, list) or not isinstance(pw, list) or len(t) != len(pw):
+        return
+    if not set(map(type, t)) <= _NUM_TYPES or not set(map(type, pw)) <= _NUM_TYPES:
+        return
+    if not math.isfinite(sum(t, 0.0)) or not math.isfinite(sum(pw, 0.0)):
         return
+    n = len(t)
+    if n > TIMESERIES_MAX_POINTS:
+        # Uniform stride over every per-sample array; the last sample is kept so the time span is unchanged.
+        step = -(-n // (TIMESERIES_MAX_POINTS - 1))
+        keep = list(range(0, n, step))
+        if keep[-1] != n - 1:
+            keep.append(n - 1)
+        ts = {k: ([v[i] for i in keep] if isinstance(v, list) and len(v) == n else v) for k, v in ts.items()}
+        # Same block energy_sampling.timeseries() writes; original_samples keeps the raw NVML count if known.
+        ds = dict(ts["downsample"]) if isinstance(ts.get("downsample"), dict) else {}
+        ds.setdefault("original_samples", n)
+        ds.update(kept=len(keep), max_points=TIMESERIES_MAX_POINTS, stride=step)
+        ts["downsample"] = ds
     tel = summary.setdefault("telemetry", {})
     b = tel.setdefault(block, {})
     b["gpu"] = ts
 
 
+def _pack_f32(xs: list) -> Dict[str, Any]:
+    a = array("f", (float("nan") if x is None else x for x in xs))
+    if sys.byteorder != "little":
+        a.byteswap()
+    return {"encoding": "b64-f32", "n": len(xs), "data": base64.b64encode(a.tobytes()).decode("ascii")}
+
+
+def _pack_telemetry(summary: Dict[str, Any]) -> None:
+    """
+    Re-encode attached telemetry arrays as base64 float32 blobs (about a third of the JSON text size).
+
+    Arrays of numbers and nulls are packed, a null sample becoming NaN (the dashboard reads both as a gap).
+    float32 keeps ~7 significant digits: sub-millisecond t_s resolution for runs under ~1000 s.
+    """
+    tel = summary.get("telemetry")
+    if not isinstance(tel, dict):
+        return
+    for b in tel.values():
+        gpu = b.get("gpu") if isinstance(b, dict) else None
+        if not isinstance(gpu, dict):
+            continue
+        for k, v in gpu.items():
+            if isinstance(v, list) and v and all(x is None or (isinstance(x, (int, float)) and not isinstance(x, bool)) for x in v):
+                gpu[k] = _pack_f32(v)
+
+
 def build_from_babel_out(results: Dict[str, Any], receipt_energy: Optional[Dict[str, Any]], *, source_path: str) -> Dict[str, Any]:
     # Prefer ctdr_dpx if present, else indexed baseline numbers (babel can run without GPU).
     methods = results.get("methods", {}) if isinstance(results, dict) else {}
@@ -225,7 +418,20 @@ def main() -> int:
     ap.add_argument("--out", required=True, help="Output path for summary_public.json")
     ap.add_argument("--ab-compare", help="Path to B_compare.json")
     ap.add_argument("--babel-out", help="Path to Babel out-dir (contains results.json, optional receipt_energy.json)")
+    ap.add_argument(
+        "--hash-alg",
+        choices=(*HASH_ALGS, "auto"),
+        default="sha256",
+        help="Digest for source artifacts (recorded as source.hash_alg). auto: sha256 with CPU SHA extensions, else blake2b",
+    )
+    ap.add_argument(
+        "--telemetry-encoding",
+        choices=TELEMETRY_ENCODINGS,
+        default="json",
+        help="How attached telemetry arrays are stored. b64-f32: base64 little-endian float32 blobs (smaller; lossy past ~7 digits)",
+    )
     args = ap.parse_args()
+    hash_alg = _auto_hash_alg() if args.hash_alg == "auto" else args.hash_alg
 
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -238,7 +444,7 @@ def main() -> int:
     if args.ab_compare:
         p = Path(args.ab_compare)
         d = _load_json(p)
-        summary = build_from_ab_compare(d, source_path=str(p.as_posix()), source_sha=_sha256_hex(p))
+        summary = build_from_ab_compare(d, source_path=str(p.as_posix()), source_sha=_file_digest(p, hash_alg), hash_alg=hash_alg)
 
         # Optional: if sibling per-engine JSONs exist and include energy.timeseries, attach them.
         # (This is best-effort because packs can be built from a standalone B_compare.json.)
@@ -266,7 +472,9 @@ def main() -> int:
         receipt = _load_json(receipt_p) if receipt_p.exists() else None
         summary = build_from_babel_out(results, receipt, source_path=str(ddir.as_posix()))
 
-    out_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    if args.telemetry_encoding == "b64-f32":
+        _pack_telemetry(summary)
+    _write_json(out_path, summary)
     print(f"OK: wrote {out_path}")
     return 0
 
@@ -3,14 +3,23 @@
 Validate summary_public.json against Pack Standard v1.
 
 No external deps (no jsonschema). This is a minimal structural validator.
+If fastjsonschema is installed, the schema is compiled once at import and valid summaries take that
+code-generated path; invalid ones are re-checked by the structural validator so every error is reported.
 """
 
 from __future__ import annotations
 
 import argparse
+import base64
+import binascii
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fastjsonschema  # optional
+except ImportError:  # pragma: no cover
+    fastjsonschema = None
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]  # public_release_maxwell/
@@ -29,11 +38,78 @@ def _is_num(x: Any) -> bool:
     return isinstance(x, (int, float)) and not isinstance(x, bool)
 
 
+_NUM_TYPES = frozenset((int, float))
+
+
+def _is_num_array(x: Any) -> bool:
+    # Same rule as _is_num per element (JSON only yields int/float/bool/str/None/list/dict), but the
+    # type scan runs in C: telemetry arrays hold thousands of samples.
+    return isinstance(x, list) and set(map(type, x)) <= _NUM_TYPES
+
+
+def _telemetry_len(x: Any) -> Optional[int]:
+    """
+    Sample count of a telemetry array: a plain number array, or a packed
+    {"encoding": "b64-f32", "n": int, "data": str} blob (float32 is numeric by construction, so only the
+    byte length is checked). None if neither.
+    """
+    if isinstance(x, list):
+        return len(x) if _is_num_array(x) else None
+    if not isinstance(x, dict) or x.get("encoding") != "b64-f32":
+        return None
+    n, data = x.get("n"), x.get("data")
+    if not isinstance(n, int) or isinstance(n, bool) or not isinstance(data, str):
+        return None
+    try:
+        raw = base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    return n if len(raw) == 4 * n else None
+
+
+def _compile_schema() -> Optional[Callable[[Any], Any]]:
+    if fastjsonschema is None or not SCHEMA_FILE.exists():
+        return None
+    try:
+        return fastjsonschema.compile(_load_json(SCHEMA_FILE))
+    except fastjsonschema.JsonSchemaDefinitionException:
+        return None
+
+
+_SCHEMA_CHECK = _compile_schema()
+
+
+def _schema_error(e: Any) -> str:
+    # fastjsonschema messages name the value as "data" / "data.metrics.omega.qps".
+    msg = str(e.message)
+    if msg.startswith("data."):
+        return msg[len("data.") :]
+    if msg.startswith("data "):
+        return "root " + msg[len("data ") :]
+    return msg
+
+
 def validate(summary: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    if _SCHEMA_CHECK is not None and isinstance(summary, dict):
+        try:
+            _SCHEMA_CHECK(summary)
+        except fastjsonschema.JsonSchemaValueException as e:
+            # The compiled check stops at the first failure; the structural pass lists all of them.
+            errors = _structural_errors(summary)
+            return False, errors or [_schema_error(e)]
+        # The schema leaves telemetry arrays open; those checks still run here.
+        errors = []
+        _check_telemetry(summary.get("telemetry"), errors)
+        return (len(errors) == 0), errors
+    errors = _structural_errors(summary)
+    return (len(errors) == 0), errors
+
+
+def _structural_errors(summary: Dict[str, Any]) -> List[str]:
     errors: List[str] = []
 
     if not isinstance(summary, dict):
-        return False, ["root must be an object"]
+        return ["root must be an object"]
 
     if summary.get("schema") != "sigma_summary_public_v1":
         _err(errors, "schema must be 'sigma_summary_public_v1'")
@@ -45,7 +121,7 @@ def validate(summary: Dict[str, Any]) -> Tuple[bool, List[str]]:
     metrics = summary.get("metrics")
     if not isinstance(metrics, dict):
         _err(errors, "metrics must be an object")
-        return False, errors
+        return errors
 
     for block in ("omega", "baseline"):
         m = metrics.get(block)
@@ -67,35 +143,40 @@ def validate(summary: Dict[str, Any]) -> Tuple[bool, List[str]]:
     if not isinstance(disc, list) or not disc or not all(isinstance(x, str) for x in disc):
         _err(errors, "disclaimers must be a non-empty string array")
 
-    # Optional telemetry: minimal structural checks (keep validator lightweight).
-    tel = summary.get("telemetry")
-    if tel is not None:
-        if not isinstance(tel, dict):
-            _err(errors, "telemetry must be an object if present")
-        else:
-            for block in ("omega", "baseline"):
-                b = tel.get(block)
-                if b is None:
-                    continue
-                if not isinstance(b, dict):
-                    _err(errors, f"telemetry.{block} must be an object")
-                    continue
-                gpu = b.get("gpu")
-                if gpu is None:
-                    continue
-                if not isinstance(gpu, dict):
-                    _err(errors, f"telemetry.{block}.gpu must be an object")
-                    continue
-                t = gpu.get("t_s")
-                pw = gpu.get("power_w")
-                if t is not None and (not isinstance(t, list) or not all(_is_num(x) for x in t)):
-                    _err(errors, f"telemetry.{block}.gpu.t_s must be a number array if present")
-                if pw is not None and (not isinstance(pw, list) or not all(_is_num(x) for x in pw)):
-                    _err(errors, f"telemetry.{block}.gpu.power_w must be a number array if present")
-                if isinstance(t, list) and isinstance(pw, list) and len(t) != len(pw):
-                    _err(errors, f"telemetry.{block}.gpu arrays must have matching lengths (t_s vs power_w)")
+    _check_telemetry(summary.get("telemetry"), errors)
+    return errors
 
-    return (len(errors) == 0), errors
+
+def _check_telemetry(tel: Any, errors: List[str]) -> None:
+    # Optional telemetry: minimal structural checks (keep validator lightweight).
+    if tel is None:
+        return
+    if not isinstance(tel, dict):
+        _err(errors, "telemetry must be an object if present")
+        return
+    for block in ("omega", "baseline"):
+        b = tel.get(block)
+        if b is None:
+            continue
+        if not isinstance(b, dict):
+            _err(errors, f"telemetry.{block} must be an object")
+            continue
+        gpu = b.get("gpu")
+        if gpu is None:
+            continue
+        if not isinstance(gpu, dict):
+            _err(errors, f"telemetry.{block}.gpu must be an object")
+            continue
+        t = gpu.get("t_s")
+        pw = gpu.get("power_w")
+        nt = _telemetry_len(t) if t is not None else None
+        npw = _telemetry_len(pw) if pw is not None else None
+        if t is not None and nt is None:
+            _err(errors, f"telemetry.{block}.gpu.t_s must be a number array (or b64-f32 blob) if present")
+        if pw is not None and npw is None:
+            _err(errors, f"telemetry.{block}.gpu.power_w must be a number array (or b64-f32 blob) if present")
+        if nt is not None and npw is not None and nt != npw:
+            _err(errors, f"telemetry.{block}.gpu arrays must have matching lengths (t_s vs power_w)")
 
 
 def main() -> int:
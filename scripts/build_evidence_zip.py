@@ -7,16 +7,27 @@ Principles:
 - Keep this repo self-contained: only include files under this public bundle.
 
 Output:
-- evidence_public/evidence.zip
+- evidence_public/evidence.zip (with a SHA256SUMS manifest at its root)
 - evidence_public/README.md (must exist)
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import mmap
+import os
 import sys
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, List
+
+try:
+    from isal import isal_zlib  # optional: ISA-L deflate/crc32 (SIMD), zlib-compatible API
+except ImportError:  # pragma: no cover
+    isal_zlib = None
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]  # public_release_maxwell/
@@ -27,6 +38,13 @@ CHALLENGE_DIR = REPO_ROOT / "babel_challenge"
 PACK_FORMAT_DIR = REPO_ROOT / "pack_format"
 PACK_TOOLS_DIR = REPO_ROOT / "pack_tools"
 POSTS_DIR = REPO_ROOT / "posts"
+# Digests from earlier builds, keyed by resolved path; reused while (st_mtime_ns, st_size) match. Not committed.
+HASH_CACHE = EVIDENCE_PUBLIC / ".hash_cache.json"
+# Per-directory glob results from earlier builds, reused while the directory's mtime is unchanged. Not committed.
+MANIFEST_CACHE = EVIDENCE_PUBLIC / ".manifest.json"
+# Usually entropy-coded formats: stored as-is unless a quick probe shows deflate still pays off
+# (e.g. matplotlib PNGs written at a low zlib level).
+STORED_SUFFIXES = frozenset((".png", ".jpg", ".jpeg", ".gif", ".webp", ".mp4", ".pdf", ".zip", ".gz"))
 
 
 def _rel(p: Path) -> str:
@@ -34,19 +52,124 @@ def _rel(p: Path) -> str:
 
 
 def _collect_existing(paths: Iterable[Path]) -> List[Path]:
-    out: List[Path] = []
+    # One scandir per parent directory instead of a stat per path; order of `paths` is kept.
+    paths = list(paths)
+    present: Dict[Path, set] = {}
+    for parent in {p.parent for p in paths}:
+        try:
+            with os.scandir(parent) as it:
+                present[parent] = {e.name for e in it if e.is_file()}
+        except OSError:
+            present[parent] = set()
+    return [p for p in paths if p.name in present[p.parent]]
+
+
+def _glob_dir(base: Path, pattern: str, manifest: Dict[str, Any]) -> List[Path]:
+    """
+    Files in `base` matching the (non-recursive) `pattern`. The match list is reused from `manifest`
+    while the directory's mtime_ns is unchanged: adding, removing or renaming an entry bumps it.
+    """
+    try:
+        mtime_ns = base.stat().st_mtime_ns
+    except OSError:
+        return []
+    key = f"{base.resolve()}|{pattern}"
+    hit = manifest.get(key)
+    if isinstance(hit, dict) and hit.get("mtime_ns") == mtime_ns and isinstance(hit.get("files"), list):
+        return [base / name for name in hit["files"]]
+    found = sorted(p for p in base.glob(pattern) if p.is_file())
+    manifest[key] = {"mtime_ns": mtime_ns, "files": [p.name for p in found]}
+    return found
+
+
+def _sha256_hex(path: Path) -> str:
+    # Hashed straight from the page cache via mmap (no read copy); streamed reads where mmap is unavailable
+    # (empty files, special files, >2 GiB on 32-bit).
+    with path.open("rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h = hashlib.sha256()
+                h.update(mm)
+                return h.hexdigest()
+        except (OSError, ValueError, OverflowError):
+            pass
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+def _use_isal_deflate() -> bool:
+    """
+    Route zipfile's deflate and CRC-32 through ISA-L when installed. The output is standard deflate (any
+    unzip reads it); ISA-L's default level (2 of 0-3) trades some size for speed.
+    """
+    if isal_zlib is None:
+        return False
+    zipfile.zlib = isal_zlib  # type: ignore[attr-defined]
+    zipfile.crc32 = isal_zlib.crc32  # type: ignore[attr-defined]
+    return True
+
+
+def _compress_type(p: Path) -> int:
+    if p.suffix.lower() not in STORED_SUFFIXES:
+        return zipfile.ZIP_DEFLATED
+    with p.open("rb") as f:
+        head = f.read(1 << 16)
+    # Fast level-1 deflate of the first 64 KiB; keep deflate only if it saves at least 5%.
+    if head and len(zlib.compress(head, 1)) < 0.95 * len(head):
+        return zipfile.ZIP_DEFLATED
+    return zipfile.ZIP_STORED
+
+
+def _load_cache(path: Path) -> Dict[str, Any]:
+    try:
+        d = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return d if isinstance(d, dict) else {}
+
+
+def _save_cache(path: Path, cache: Dict[str, Any]) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(cache, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache only; the next build recomputes
+
+
+def _digest_all(paths: List[Path], cache: Dict[str, Any]) -> Dict[Path, str]:
+    """
+    sha256 of every file. Cached digests are reused while the file's mtime_ns and size are unchanged;
+    the rest are hashed in parallel (hashlib releases the GIL while hashing). `cache` is rewritten to
+    hold exactly these files.
+    """
+    out: Dict[Path, str] = {}
+    fresh: Dict[str, Any] = {}
+    todo: List[Path] = []
     for p in paths:
-        if p.exists() and p.is_file():
-            out.append(p)
+        st = p.stat()
+        key = str(p.resolve())
+        entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        hit = cache.get(key)
+        if isinstance(hit, dict) and isinstance(hit.get("sha256"), str) and all(hit.get(k) == v for k, v in entry.items()):
+            out[p] = hit["sha256"]
+        else:
+            todo.append(p)
+        fresh[key] = {**entry, "sha256": out.get(p)}
+    if todo:
+        with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1)) as ex:
+            for p, digest in zip(todo, ex.map(_sha256_hex, todo)):
+                out[p] = digest
+                fresh[str(p.resolve())]["sha256"] = digest
+    cache.clear()
+    cache.update(fresh)
     return out
 
 
-def _glob_dir(base: Path, pattern: str) -> List[Path]:
-    if not base.exists():
-        return []
-    return [p for p in base.glob(pattern) if p.is_file()]
-
-
 def main() -> int:
     # Must have README.md present (committed), zip is generated.
     readme = EVIDENCE_PUBLIC / "README.md"
@@ -60,6 +183,7 @@ def main() -> int:
     out_zip = EVIDENCE_PUBLIC / "evidence.zip"
 
     files: List[Path] = []
+    manifest = _load_cache(MANIFEST_CACHE)
 
     # 1) Assets (PNG graphs + packs)
     files += _collect_existing(
@@ -74,47 +198,61 @@ def main() -> int:
     )
 
     # 2) Maxwell dashboard (static narrative; public-safe)
-    files += _glob_dir(DASHBOARD_DIR, "*.html")
-    files += _glob_dir(DASHBOARD_DIR, "*.css")
-    files += _glob_dir(DASHBOARD_DIR, "*.js")
-    files += _glob_dir(DASHBOARD_DIR, "*.md")
+    files += _glob_dir(DASHBOARD_DIR, "*.html", manifest)
+    files += _glob_dir(DASHBOARD_DIR, "*.css", manifest)
+    files += _glob_dir(DASHBOARD_DIR, "*.js", manifest)
+    files += _glob_dir(DASHBOARD_DIR, "*.md", manifest)
 
     # 3) Babel challenge runner (procedural dataset + harness; public-safe)
-    files += _glob_dir(CHALLENGE_DIR, "*.py")
-    files += _glob_dir(CHALLENGE_DIR, "*.md")
+    files += _glob_dir(CHALLENGE_DIR, "*.py", manifest)
+    files += _glob_dir(CHALLENGE_DIR, "*.md", manifest)
 
     # 4) Pack Standard v1 (schema + tools) for community submissions
-    files += _glob_dir(PACK_FORMAT_DIR, "*.md")
-    files += _glob_dir(PACK_FORMAT_DIR, "*.json")
-    files += _glob_dir(PACK_TOOLS_DIR, "*.py")
+    files += _glob_dir(PACK_FORMAT_DIR, "*.md", manifest)
+    files += _glob_dir(PACK_FORMAT_DIR, "*.json", manifest)
+    files += _glob_dir(PACK_TOOLS_DIR, "*.py", manifest)
 
     # 5) Posts (public copy, ready to paste)
-    files += _glob_dir(POSTS_DIR, "*.md")
+    files += _glob_dir(POSTS_DIR, "*.md", manifest)
 
     # 6) Include README at the root of the zip as entry point.
     files.append(readme)
 
-    # De-duplicate
+    _save_cache(MANIFEST_CACHE, manifest)
+
+    # De-duplicate by inode: catches the same file reached through symlinks or hardlinks.
     uniq: List[Path] = []
     seen = set()
     for p in files:
-        rp = str(p.resolve())
-        if rp in seen:
+        st = p.stat()
+        key = (st.st_dev, st.st_ino)
+        if key in seen:
             continue
-        seen.add(rp)
+        seen.add(key)
         uniq.append(p)
 
-    # Build zip
+    # Hash everything up front (in parallel), then build the zip with a manifest:
+    # `sha256sum -c SHA256SUMS` in the extracted folder verifies every file.
+    hash_cache = _load_cache(HASH_CACHE)
+    digests = _digest_all(uniq, hash_cache)
+    _save_cache(HASH_CACHE, hash_cache)
+
     if out_zip.exists():
         out_zip.unlink()
 
+    deflate = "isal" if _use_isal_deflate() else "zlib"
+    # Members are deflated serially: zipfile has no public way to insert pre-deflated data (writestr
+    # always recompresses), and the whole bundle (~30 files, <1 MB) builds in ~20 ms.
+    sums: List[str] = []
     with zipfile.ZipFile(out_zip, "w", compression=zipfile.ZIP_DEFLATED) as z:
         for p in uniq:
             # Place README at zip root; others under their repo-relative paths.
             arc = "README.md" if p == readme else _rel(p)
-            z.write(p, arcname=arc)
+            z.write(p, arcname=arc, compress_type=_compress_type(p))
+            sums.append(f"{digests[p]}  {arc}\n")
+        z.writestr("SHA256SUMS", "".join(sums))
 
-    print(f"OK: wrote {out_zip} ({len(uniq)} files)")
+    print(f"OK: wrote {out_zip} ({len(uniq)} files, deflate={deflate})")
     return 0
 
 
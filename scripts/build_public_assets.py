@@ -14,14 +14,22 @@ Outputs:
 
 from __future__ import annotations
 
+import argparse
 import json
 import math
 import hashlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
+import PIL
 from PIL import Image, ImageDraw, ImageFont
 
+try:
+    import orjson  # optional: faster encode of the summary payload
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 REPO_ROOT = Path(__file__).resolve().parents[1]  # public_release_maxwell/
 ASSETS_DIR = REPO_ROOT / "assets"
@@ -32,18 +40,60 @@ DEFAULT_JQUERY_JSON = (
 )
 
 
+# zlib level for chart PNGs: 6 (Pillow's default) for the committed assets; --fast uses 1, which
+# encodes ~1.3-1.5x faster for ~45% larger files (fine for previews / CI regeneration).
+PNG_COMPRESS_LEVEL = 6
+PNG_COMPRESS_LEVEL_FAST = 1
+
+
+# Charts are drawn on a fixed 6-color palette ("P" mode, 4-bit PNG): a third of the RGB pixel buffer and
+# far less data through zlib. Text is rendered aliased (no gray ramps) in this mode.
+_WHITE, _BLACK, _BLUE, _RED, _GRAY, _LIGHT_GRAY = range(6)
+_PALETTE = [
+    255, 255, 255,
+    0, 0, 0,
+    20, 90, 200,
+    220, 40, 40,
+    120, 120, 120,
+    235, 235, 235,
+]
+
+
+def _new_chart(size: Tuple[int, int]) -> Image.Image:
+    img = Image.new("P", size, _WHITE)
+    img.putpalette(_PALETTE)
+    return img
+
+
 def _load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 def _sha256_hex(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
-
-
+    # Streamed: constant memory regardless of artifact size.
+    with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        # Pre-3.11: one reused 64 KiB buffer (cache-resident), no per-chunk bytes allocation.
+        h = hashlib.sha256()
+        buf = memoryview(bytearray(1 << 16))
+        while n := f.readinto(buf):
+            h.update(buf[:n])
+        return h.hexdigest()
+
+
+@lru_cache(maxsize=8)
 def _font(size: int) -> ImageFont.ImageFont:
     # Pillow's default bitmap font is always available. Keep it deterministic.
+    # Cached: every draw.text asks for a font, and load_default() re-reads the bundled font data.
     return ImageFont.load_default()
 
 
+def _save_png(img: Image.Image, out_path: Path, *, fast: bool) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    level = PNG_COMPRESS_LEVEL_FAST if fast else PNG_COMPRESS_LEVEL
+    img.save(out_path, format="PNG", compress_level=level, optimize=False, bits=4)
+
+
 def _draw_axes(
     draw: ImageDraw.ImageDraw,
     *,
@@ -54,22 +104,22 @@ def _draw_axes(
 ) -> None:
     x0, y0, x1, y1 = box
     # Frame
-    draw.rectangle([x0, y0, x1, y1], outline=(0, 0, 0), width=2)
+    draw.rectangle([x0, y0, x1, y1], outline=_BLACK, width=2)
     # Title
-    draw.text((x0, y0 - 18), title, fill=(0, 0, 0), font=_font(14))
+    draw.text((x0, y0 - 18), title, fill=_BLACK, font=_font(14))
     # Axis labels
-    draw.text((x0, y1 + 6), x_label, fill=(0, 0, 0), font=_font(12))
-    draw.text((x0 - 2, y0 - 30), y_label, fill=(0, 0, 0), font=_font(12))
+    draw.text((x0, y1 + 6), x_label, fill=_BLACK, font=_font(12))
+    draw.text((x0 - 2, y0 - 30), y_label, fill=_BLACK, font=_font(12))
 
 
-def _oom_wall_plot(out_path: Path) -> None:
+def _oom_wall_plot(out_path: Path, *, fast: bool = False) -> None:
     """
     Plot: required HBM (GB) for explicit fp16 NxN materialization vs N.
     Uses an analytic formula: bytes = N^2 * 2.
     Visualized in log-log (by applying log10 transform to axes).
     """
     W, H = 1100, 650
-    img = Image.new("RGB", (W, H), (255, 255, 255))
+    img = _new_chart((W, H))
     draw = ImageDraw.Draw(img)
 
     plot = (120, 110, 1040, 520)  # left, top, right, bottom
@@ -93,20 +143,23 @@ def _oom_wall_plot(out_path: Path) -> None:
     x_min, x_max = min(x_vals), max(x_vals)
     y_min, y_max = min(y_vals), max(y_vals)
 
+    # Affine log-value -> pixel maps; scale factors computed once, not per point.
+    px0, py0, px1, py1 = plot
+    x_scale = (px1 - px0) / (x_max - x_min)
+    y_scale = (py1 - py0) / (y_max - y_min)
+
     def x_map(x: float) -> int:
-        x0, y0, x1, y1 = plot
-        return int(x0 + (x - x_min) * (x1 - x0) / (x_max - x_min))
+        return int(px0 + (x - x_min) * x_scale)
 
     def y_map(y: float) -> int:
-        x0, y0, x1, y1 = plot
-        return int(y1 - (y - y_min) * (y1 - y0) / (y_max - y_min))
+        return int(py1 - (y - y_min) * y_scale)
 
     # Draw grid ticks for N.
     for n in [1_000, 10_000, 100_000, 1_000_000]:
         lx = math.log10(n)
         xx = x_map(lx)
-        draw.line([(xx, plot[1]), (xx, plot[3])], fill=(235, 235, 235), width=1)
-        draw.text((xx - 18, plot[3] + 20), f"{n//1000}k" if n < 1_000_000 else "1M", fill=(0, 0, 0), font=_font(12))
+        draw.line([(xx, plot[1]), (xx, plot[3])], fill=_LIGHT_GRAY, width=1)
+        draw.text((xx - 18, plot[3] + 20), f"{n//1000}k" if n < 1_000_000 else "1M", fill=_BLACK, font=_font(12))
 
     # Draw grid ticks for GB.
     for g in [0.01, 0.1, 1, 10, 80, 100, 500, 1000]:
@@ -114,51 +167,53 @@ def _oom_wall_plot(out_path: Path) -> None:
         if ly < y_min or ly > y_max:
             continue
         yy = y_map(ly)
-        draw.line([(plot[0], yy), (plot[2], yy)], fill=(235, 235, 235), width=1)
-        draw.text((plot[0] - 55, yy - 6), f"{g:g}", fill=(0, 0, 0), font=_font(12))
+        draw.line([(plot[0], yy), (plot[2], yy)], fill=_LIGHT_GRAY, width=1)
+        draw.text((plot[0] - 55, yy - 6), f"{g:g}", fill=_BLACK, font=_font(12))
 
     # H100 80GB line (marketing / decimal).
     h100_gb = 80.0
     ly80 = math.log10(h100_gb)
     if y_min <= ly80 <= y_max:
         yy80 = y_map(ly80)
-        draw.line([(plot[0], yy80), (plot[2], yy80)], fill=(220, 40, 40), width=3)
-        draw.text((plot[0] + 8, yy80 - 18), "H100 80GB (HBM)", fill=(220, 40, 40), font=_font(12))
+        draw.line([(plot[0], yy80), (plot[2], yy80)], fill=_RED, width=3)
+        draw.text((plot[0] + 8, yy80 - 18), "H100 80GB (HBM)", fill=_RED, font=_font(12))
 
     # Plot curve.
     pts = [(x_map(x), y_map(y)) for x, y in zip(x_vals, y_vals)]
-    draw.line(pts, fill=(20, 90, 200), width=4)
+    draw.line(pts, fill=_BLUE, width=4)
     for (x, y), n, g in zip(pts, ns, gb):
         r = 4
-        draw.ellipse([x - r, y - r, x + r, y + r], fill=(20, 90, 200))
+        draw.ellipse([x - r, y - r, x + r, y + r], fill=_BLUE)
         if n in (500_000,):
-            draw.text((x + 10, y - 10), f"N=500k → {g:.0f} GB", fill=(0, 0, 0), font=_font(12))
+            draw.text((x + 10, y - 10), f"N=500k → {g:.0f} GB", fill=_BLACK, font=_font(12))
 
     # Footer note: include "how many H100" at a couple points (dramatic, but purely analytic).
     # N=1M => 2TB => 25×80GB; N=2M => 8TB => 100×80GB (ignores overheads).
     draw.text(
         (120, 560),
         "Formula: fp16 NxN bytes = N^2 * 2 (decimal GB). N=1M → 2TB ≈ 25×H100(80GB); N=2M → 8TB ≈ 100×H100. (Memory only.)",
-        fill=(0, 0, 0),
+        fill=_BLACK,
         font=_font(12),
     )
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(out_path, format="PNG")
+    _save_png(img, out_path, fast=fast)
 
 
-def _joules_per_query_plot(out_path: Path, *, src_json: Path) -> None:
+def _joules_per_query_plot(
+    out_path: Path, *, src_json: Path, data: Optional[Dict[str, Any]] = None, fast: bool = False
+) -> None:
     """
     Bar chart: measured J/query for CTDR vs vector_scan baseline, from B_compare.json.
+    `data` is src_json already parsed (main() loads it once for every consumer).
     """
-    d = _load_json(src_json)
+    d = data if data is not None else _load_json(src_json)
     c = d["ctdr"]["energy"]["joules_per_query"]
     v = d["vector"]["energy"]["joules_per_query"]
     c_power = d["ctdr"]["energy"]["power_w_avg"]
     v_power = d["vector"]["energy"]["power_w_avg"]
 
     W, H = 1100, 650
-    img = Image.new("RGB", (W, H), (255, 255, 255))
+    img = _new_chart((W, H))
     draw = ImageDraw.Draw(img)
 
     plot = (120, 120, 1040, 520)
@@ -185,21 +240,21 @@ def _joules_per_query_plot(out_path: Path, *, src_json: Path) -> None:
     x_vec = x_ctdr + bar_w + gap
 
     for x, val, color, label in [
-        (x_ctdr, float(c), (20, 90, 200), "CTDR (DPX LCP index_top1_gpu)"),
-        (x_vec, float(v), (120, 120, 120), "Vector baseline (GPU cosine fp32 scan)"),
+        (x_ctdr, float(c), _BLUE, "CTDR (DPX LCP index_top1_gpu)"),
+        (x_vec, float(v), _GRAY, "Vector baseline (GPU cosine fp32 scan)"),
     ]:
         y = y_map(val)
-        draw.rectangle([x, y, x + bar_w, plot[3]], fill=color, outline=(0, 0, 0), width=2)
-        draw.text((x, plot[3] + 20), label, fill=(0, 0, 0), font=_font(12))
-        draw.text((x, y - 20), f"{val:.3f} J/query", fill=(0, 0, 0), font=_font(12))
+        draw.rectangle([x, y, x + bar_w, plot[3]], fill=color, outline=_BLACK, width=2)
+        draw.text((x, plot[3] + 20), label, fill=_BLACK, font=_font(12))
+        draw.text((x, y - 20), f"{val:.3f} J/query", fill=_BLACK, font=_font(12))
 
     # Light y-grid
     for t in [0.1, 0.2, 0.3, 0.4, 0.5, 0.6]:
         if t > y_max:
             continue
         yy = y_map(t)
-        draw.line([(plot[0], yy), (plot[2], yy)], fill=(235, 235, 235), width=1)
-        draw.text((plot[0] - 55, yy - 6), f"{t:.1f}", fill=(0, 0, 0), font=_font(12))
+        draw.line([(plot[0], yy), (plot[2], yy)], fill=_LIGHT_GRAY, width=1)
+        draw.text((plot[0] - 55, yy - 6), f"{t:.1f}", fill=_BLACK, font=_font(12))
 
     # Footer: power context + baseline caveat
     note = (
@@ -207,26 +262,52 @@ def _joules_per_query_plot(out_path: Path, *, src_json: Path) -> None:
         f"Power avg: CTDR {c_power:.1f}W vs Vector {v_power:.1f}W | "
         "Baseline note: vector_scan is brute-force cosine over fp32 vectors (chunked), not semantic embeddings."
     )
-    draw.text((120, 560), note, fill=(0, 0, 0), font=_font(12))
+    draw.text((120, 560), note, fill=_BLACK, font=_font(12))
+
+    _save_png(img, out_path, fast=fast)
+
+# Pack Standard v1 metric -> path inside a B_compare.json engine block ("ctdr" / "vector").
+_METRIC_PATHS = (
+    ("qps", ("qps",)),
+    ("lat_p95_ms", ("latency_ms", "p95")),
+    ("joules_per_query", ("energy", "joules_per_query")),
+    ("power_w_avg", ("energy", "power_w_avg")),
+    ("gpu_util_pct_avg", ("energy", "gpu_util_pct_avg")),
+    ("temp_c_avg", ("energy", "temp_c_avg")),
+    ("top1_accuracy", ("accuracy", "top1_accuracy")),
+)
+# Engine-block fields copied verbatim into summary["measured"].
+_MEASURED_KEYS = ("mode", "n_candidates", "n_queries", "duration_s", "qps", "latency_ms", "energy", "accuracy")
+
+
+def _num_at(d: Any, *keys: str) -> Optional[float]:
+    # float(d[k0][k1]...) or None if any level is missing / not a dict.
+    for k in keys:
+        d = d.get(k) if isinstance(d, dict) else None
+    return float(d) if d is not None else None
+
+
+def _measured_block(b: Dict[str, Any], *, notes: Any) -> Dict[str, Any]:
+    out = {k: b.get(k) for k in _MEASURED_KEYS}
+    out["notes"] = notes
+    return out
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(out_path, format="PNG")
 
-def _build_public_summary(*, src_json: Path) -> Dict[str, Any]:
+def _build_public_summary(*, src_json: Path, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Build a public-safe summary object used by the Maxwell dashboard.
     Hard rule: only derive from public-safe artifacts.
     """
-    d = _load_json(src_json)
+    d = data if data is not None else _load_json(src_json)
 
     # OOM wall analytic boundary: fp16 NxN bytes = N^2 * 2
     h100_gb = 80.0  # decimal GB
     n_at_80gb = int(math.isqrt(int(h100_gb * 1_000_000_000 / 2)))
 
-    def _h100s_required_for_n(n: int) -> int:
-        # Required GPUs just to fit fp16 NxN bytes, ignoring overheads.
-        gb_req = (n * n * 2) / 1_000_000_000
-        return int(math.ceil(gb_req / h100_gb))
+    h100_bytes = int(h100_gb * 1_000_000_000)
+    points = {"n_200k": 200_000, "n_500k": 500_000, "n_1m": 1_000_000, "n_2m": 2_000_000}
+    # Required GPUs just to fit fp16 NxN bytes, ignoring overheads (exact integer ceil).
+    h100s_required = {k: -(-(n * n * 2) // h100_bytes) for k, n in points.items()}
 
     # Pack Standard v1 (community comparison) keys:
     # - keep legacy fields for the narrative dashboard
@@ -245,51 +326,15 @@ def _build_public_summary(*, src_json: Path) -> Dict[str, Any]:
             "power_limit_w": d.get("ctdr", {}).get("energy", {}).get("metadata", {}).get("power_limit_w", None),
         },
         "metrics": {
-            "omega": {
-                "qps": float(ctdr.get("qps")) if ctdr.get("qps") is not None else None,
-                "lat_p95_ms": float(ctdr.get("latency_ms", {}).get("p95")) if isinstance(ctdr.get("latency_ms"), dict) else None,
-                "joules_per_query": float(ctdr.get("energy", {}).get("joules_per_query")) if isinstance(ctdr.get("energy"), dict) and ctdr.get("energy", {}).get("joules_per_query") is not None else None,
-                "power_w_avg": float(ctdr.get("energy", {}).get("power_w_avg")) if isinstance(ctdr.get("energy"), dict) and ctdr.get("energy", {}).get("power_w_avg") is not None else None,
-                "gpu_util_pct_avg": float(ctdr.get("energy", {}).get("gpu_util_pct_avg")) if isinstance(ctdr.get("energy"), dict) and ctdr.get("energy", {}).get("gpu_util_pct_avg") is not None else None,
-                "temp_c_avg": float(ctdr.get("energy", {}).get("temp_c_avg")) if isinstance(ctdr.get("energy"), dict) and ctdr.get("energy", {}).get("temp_c_avg") is not None else None,
-                "top1_accuracy": float(ctdr.get("accuracy", {}).get("top1_accuracy")) if isinstance(ctdr.get("accuracy"), dict) and ctdr.get("accuracy", {}).get("top1_accuracy") is not None else None,
-            },
-            "baseline": {
-                "qps": float(vec.get("qps")) if vec.get("qps") is not None else None,
-                "lat_p95_ms": float(vec.get("latency_ms", {}).get("p95")) if isinstance(vec.get("latency_ms"), dict) else None,
-                "joules_per_query": float(vec.get("energy", {}).get("joules_per_query")) if isinstance(vec.get("energy"), dict) and vec.get("energy", {}).get("joules_per_query") is not None else None,
-                "power_w_avg": float(vec.get("energy", {}).get("power_w_avg")) if isinstance(vec.get("energy"), dict) and vec.get("energy", {}).get("power_w_avg") is not None else None,
-                "gpu_util_pct_avg": float(vec.get("energy", {}).get("gpu_util_pct_avg")) if isinstance(vec.get("energy"), dict) and vec.get("energy", {}).get("gpu_util_pct_avg") is not None else None,
-                "temp_c_avg": float(vec.get("energy", {}).get("temp_c_avg")) if isinstance(vec.get("energy"), dict) and vec.get("energy", {}).get("temp_c_avg") is not None else None,
-                "top1_accuracy": float(vec.get("accuracy", {}).get("top1_accuracy")) if isinstance(vec.get("accuracy"), dict) and vec.get("accuracy", {}).get("top1_accuracy") is not None else None,
-            },
+            "omega": {k: _num_at(ctdr, *path) for k, path in _METRIC_PATHS},
+            "baseline": {k: _num_at(vec, *path) for k, path in _METRIC_PATHS},
             "feasibility": {
                 "oom_wall_n_at_80gb_fp16_nxn": n_at_80gb,
             },
         },
         "measured": {
-            "ctdr": {
-                "mode": d["ctdr"].get("mode"),
-                "n_candidates": d["ctdr"].get("n_candidates"),
-                "n_queries": d["ctdr"].get("n_queries"),
-                "duration_s": d["ctdr"].get("duration_s"),
-                "qps": d["ctdr"].get("qps"),
-                "latency_ms": d["ctdr"].get("latency_ms"),
-                "energy": d["ctdr"].get("energy"),
-                "accuracy": d["ctdr"].get("accuracy"),
-                "notes": d.get("notes", {}),
-            },
-            "baseline_vector_scan": {
-                "mode": d["vector"].get("mode"),
-                "n_candidates": d["vector"].get("n_candidates"),
-                "n_queries": d["vector"].get("n_queries"),
-                "duration_s": d["vector"].get("duration_s"),
-                "qps": d["vector"].get("qps"),
-                "latency_ms": d["vector"].get("latency_ms"),
-                "energy": d["vector"].get("energy"),
-                "accuracy": d["vector"].get("accuracy"),
-                "notes": d.get("notes", {}),
-            },
+            "ctdr": _measured_block(d["ctdr"], notes=d.get("notes", {})),
+            "baseline_vector_scan": _measured_block(d["vector"], notes=d.get("notes", {})),
             "ratios": d.get("ratios", {}),
         },
         "analytic": {
@@ -297,17 +342,8 @@ def _build_public_summary(*, src_json: Path) -> Dict[str, Any]:
                 "formula": "fp16 NxN bytes = N^2 * 2",
                 "h100_hbm_gb": h100_gb,
                 "n_at_h100_80gb": n_at_80gb,
-                "h100s_required_for_fp16_nxn": {
-                    "n_200k": _h100s_required_for_n(200_000),
-                    "n_500k": _h100s_required_for_n(500_000),
-                    "n_1m": _h100s_required_for_n(1_000_000),
-                    "n_2m": _h100s_required_for_n(2_000_000),
-                },
-                "example_points_gb": {
-                    "n_200k": (200_000 * 200_000 * 2) / 1_000_000_000,
-                    "n_500k": (500_000 * 500_000 * 2) / 1_000_000_000,
-                    "n_1m": (1_000_000 * 1_000_000 * 2) / 1_000_000_000,
-                },
+                "h100s_required_for_fp16_nxn": h100s_required,
+                "example_points_gb": {k: (n * n * 2) / 1_000_000_000 for k, n in points.items() if k != "n_2m"},
             }
         },
         "assets": {
@@ -322,35 +358,74 @@ def _build_public_summary(*, src_json: Path) -> Dict[str, Any]:
     }
     return summary
 
-def _write_public_summary_assets(*, src_json: Path) -> None:
-    summary = _build_public_summary(src_json=src_json)
+def _has_non_finite(obj: Any) -> bool:
+    # NaN/Infinity: orjson writes null, the stdlib NaN/Infinity literals.
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(map(_has_non_finite, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        return any(map(_has_non_finite, obj))
+    return False
+
+
+def _write_public_summary_assets(*, src_json: Path, data: Optional[Dict[str, Any]] = None) -> None:
+    summary = _build_public_summary(src_json=src_json, data=data)
     out_json = ASSETS_DIR / "summary_public.json"
     out_js = ASSETS_DIR / "summary_public.js"
 
-    # Deterministic JSON (no timestamps), stable key order
-    payload = json.dumps(summary, ensure_ascii=False, indent=2, sort_keys=True)
-    out_json.write_text(payload + "\n", encoding="utf-8")
-    out_js.write_text(
-        "/* Auto-generated. Do not edit. */\n"
-        "window.SIGMA_PUBLIC_SUMMARY = "
-        + payload
-        + ";\n",
-        encoding="utf-8",
-    )
+    # Deterministic JSON (no timestamps), stable key order. Encoded once, as UTF-8 bytes, for both files.
+    # Non-finite values keep the stdlib encoder, so the bytes do not depend on whether orjson is installed.
+    if orjson is not None and not _has_non_finite(summary):
+        payload = orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(summary, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    out_json.write_bytes(payload + b"\n")
+    out_js.write_bytes(b"/* Auto-generated. Do not edit. */\nwindow.SIGMA_PUBLIC_SUMMARY = " + payload + b";\n")
+
+
+def _png_cache_key(src_json: Path, *, fast: bool) -> str:
+    # Everything the PNG bytes depend on: chart data, this script's drawing code, encoder settings.
+    h = hashlib.sha256()
+    h.update(src_json.read_bytes())
+    h.update(Path(__file__).read_bytes())
+    h.update(f"fast={fast};pillow={PIL.__version__}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _cached_png_key(cache_path: Path) -> Optional[str]:
+    try:
+        d = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return d.get("png_key") if isinstance(d, dict) else None
 
 
 def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fast", action="store_true", help="Encode PNGs at zlib level 1 (faster, larger; for previews)")
+    ap.add_argument("--force", action="store_true", help="Redraw the PNGs even if their inputs are unchanged")
+    args = ap.parse_args()
+
     ASSETS_DIR.mkdir(parents=True, exist_ok=True)
 
     oom_out = ASSETS_DIR / "graph_oom_wall.png"
     jq_out = ASSETS_DIR / "graph_joules_per_query.png"
+    # Not committed: records the input hash the current PNGs were drawn from.
+    build_cache = ASSETS_DIR / ".build_cache.json"
+
+    b_compare = _load_json(DEFAULT_JQUERY_JSON)
+    png_key = _png_cache_key(DEFAULT_JQUERY_JSON, fast=args.fast)
+    if not args.force and oom_out.exists() and jq_out.exists() and _cached_png_key(build_cache) == png_key:
+        print(f"OK: {oom_out.name}, {jq_out.name} up to date (inputs unchanged; --force to redraw)")
+    else:
+        _oom_wall_plot(oom_out, fast=args.fast)
+        _joules_per_query_plot(jq_out, src_json=DEFAULT_JQUERY_JSON, data=b_compare, fast=args.fast)
+        build_cache.write_text(json.dumps({"png_key": png_key}) + "\n", encoding="utf-8")
+        print(f"OK: wrote {oom_out}")
+        print(f"OK: wrote {jq_out}")
+    _write_public_summary_assets(src_json=DEFAULT_JQUERY_JSON, data=b_compare)
 
-    _oom_wall_plot(oom_out)
-    _joules_per_query_plot(jq_out, src_json=DEFAULT_JQUERY_JSON)
-    _write_public_summary_assets(src_json=DEFAULT_JQUERY_JSON)
-
-    print(f"OK: wrote {oom_out}")
-    print(f"OK: wrote {jq_out}")
     print(f"OK: wrote {ASSETS_DIR / 'summary_public.json'}")
     print(f"OK: wrote {ASSETS_DIR / 'summary_public.js'}")
     return 0